@@ -1,4 +1,4 @@
-from .compact_core import SRACore  # demo-only core
+from .core import SRACore  # full pipeline core (S1/S2 + budgets + audit)
 try:
     from .audit_logger import AuditLogger  # optional; not required by demo
 except Exception:
@@ -1,13 +1,176 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from enum import Enum
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+import functools
+import hashlib
 import re
+import string
+import time
 import uuid
 
-class ViolationType(str, Enum):
+# uuid5 namespace for ticket ids, reduced to raw bytes once at import so the
+# hot path feeds hashlib directly instead of re-parsing the UUID literal.
+_NS_BYTES = uuid.UUID("12345678-1234-5678-1234-567812345678").bytes
+
+# Template text, fallbacks, and redaction regexes are shared by every
+# CopperGround instance, so they are built once at import instead of per
+# construction (refusal generators may be created per-request in a handler).
+_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "en": {
+        "injection_detected.message": "Request blocked: embedded instructions violate isolation policy.",
+        "injection_detected.remediation": "Please rephrase the request in plain language without meta-instructions, code comments, or requests to ignore rules.",
+        "injection_detected.escalation": "If you believe this is an error, contact {contact} and include reference {ticket_id}.",
+
+        "budget_exceeded.message": "Request blocked: privacy budget would be exceeded.",
+        "budget_exceeded.remediation": "Please wait {reset_time} before retrying or reduce the scope of the request.",
+        "budget_exceeded.escalation": "For higher budgets, contact {contact} with ticket {ticket_id}.",
+
+        "system_error.message": "Request blocked: internal error; safe refusal returned.",
+        "system_error.remediation": "Please try again. If the issue persists, attempt a simpler request.",
+        "system_error.escalation": "If failures continue, contact {contact} with ticket {ticket_id}.",
+
+        "scope_violation.message": "Request blocked: the requested operation requires {required_scope} authorization.",
+        "scope_violation.remediation": "Verify your credentials or request access to the required scope.",
+        "scope_violation.escalation": "For access review, contact {contact} with ticket {ticket_id}.",
+
+        "rate_limited.message": "Request blocked: rate limit exceeded.",
+        "rate_limited.remediation": "Please wait {retry_after}s before retrying, or slow down request frequency.",
+        "rate_limited.escalation": "If you need higher throughput, contact {contact} with ticket {ticket_id}.",
+
+        "policy_violation.message": "Request blocked: this action conflicts with active policy.",
+        "policy_violation.remediation": "Rewrite the request to avoid restricted data, capabilities, or formats.",
+        "policy_violation.escalation": "For a policy exception, contact {contact} with ticket {ticket_id}.",
+    }
+}
+
+_FALLBACK_MESSAGES: Dict[str, str] = {
+    "injection_detected": "Request blocked: embedded instructions violate isolation policy.",
+    "budget_exceeded": "Request blocked: privacy budget would be exceeded.",
+    "system_error": "Request blocked: internal error; safe refusal returned.",
+    "scope_violation": "Request blocked: missing required authorization scope.",
+    "rate_limited": "Request blocked: rate limit exceeded.",
+    "policy_violation": "Request blocked: policy violation.",
+}
+
+# Flat, (locale, key)-tuple-indexed view of the template table: one hash
+# probe per lookup, no transient empty dict on a locale miss.
+_FLAT_TEMPLATES: Dict[Tuple[str, str], str] = {
+    (locale, key): text for locale, table in _TEMPLATES.items() for key, text in table.items()
+}
+
+
+def _compile_templates() -> Dict[Tuple[str, str], Tuple[Any, Any, Any]]:
+    """Prebuild per-violation (message, remediation, escalation) renderers.
+
+    Each slot is either the raw string (no placeholders) or a triple of
+    (bound ``str.format_map``, required placeholder names, raw text), so
+    emitting a refusal does a single tuple lookup, a subset test, and at most
+    two format calls — no exception-guarded formatting on the hot path.
+    Messages stay verbatim: the old path never passed vars to them.
+    """
+    formatter = string.Formatter()
+    compiled: Dict[Tuple[str, str], Tuple[Any, Any, Any]] = {}
+    for locale, key in _FLAT_TEMPLATES:
+        violation = key.split(".", 1)[0]
+        if (locale, violation) in compiled:
+            continue
+        parts: List[Any] = [_FLAT_TEMPLATES.get((locale, f"{violation}.message"))]
+        for slot in ("remediation", "escalation"):
+            text = _FLAT_TEMPLATES.get((locale, f"{violation}.{slot}"))
+            if text is None or "{" not in text:
+                parts.append(text)
+            else:
+                required = frozenset(
+                    fname for _, fname, _, _ in formatter.parse(text) if fname
+                )
+                parts.append((text.format_map, required, text))
+        compiled[(locale, violation)] = tuple(parts)
+    return compiled
+
+
+_COMPILED_TEMPLATES = _compile_templates()
+
+
+def _render_part(part: Any, safe_vars: Dict[str, Any]) -> Optional[str]:
+    """Render one prebuilt template slot against the shared vars dict."""
+    if part is None or isinstance(part, str):
+        return part
+    render, required, raw = part
+    if required <= safe_vars.keys():
+        return render(safe_vars)
+    return raw  # missing placeholder: raw template, as _tpl used to fall back
+
+
+@functools.lru_cache(maxsize=1024)
+def _render_static(
+    locale: str,
+    contact: str,
+    policy_prefix: str,
+    violation: str,
+    rule_id: str,
+    required_scope: Optional[str],
+    retry_after: Optional[int],
+    reset_time: Optional[str],
+    ticket_id: str,
+) -> Tuple[str, Optional[str], Optional[str], str]:
+    """Render the template-derived refusal fields (memoized).
+
+    Most refusals repeat the same violation type with the same small set of
+    context scalars, so identical calls skip all format work. Module-level
+    on purpose: an lru_cache on a bound method keys by ``self``, which both
+    pins generator instances alive (they may be built per request) and makes
+    every new instance a cold key — the instance scalars are passed
+    explicitly instead.
+    """
+    policy_ref = f"{policy_prefix}-{violation.upper()}-{rule_id}"
+    entry = _COMPILED_TEMPLATES.get((locale, violation))
+    if entry is None:
+        return _FALLBACK_MESSAGES.get(violation, "Request refused."), None, None, policy_ref
+
+    msg_part, rem_part, esc_part = entry
+    msg = msg_part if msg_part is not None else _FALLBACK_MESSAGES.get(violation, "Request refused.")
+
+    safe_vars: Dict[str, Any] = {
+        "contact": contact,
+        "ticket_id": ticket_id,
+    }
+    if reset_time is not None:
+        safe_vars["reset_time"] = reset_time
+    if retry_after is not None:
+        safe_vars["retry_after"] = retry_after
+    if required_scope is not None:
+        safe_vars["required_scope"] = required_scope
+
+    remediation = _render_part(rem_part, safe_vars)
+    escalation = _render_part(esc_part, safe_vars)
+    return msg, remediation, escalation, policy_ref
+
+_RX_TOKEN = re.compile(r"\b[A-Za-z0-9_\-]{24,}\b")
+_RX_EMAIL = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}")
+_RX_CARD = re.compile(r"\b\d{4}-\d{4}-\d{4}-\d{4}\b")
+_RX_SECRET = re.compile(r"(?i)\b(password|secret|token)\b\s*[:=]\s*\S+")
+_RX_BLOB = re.compile(r"\b[A-Za-z0-9+/=]{40,}\b")
+
+# Loose superset of all five redaction families (word boundaries and tails
+# dropped): one scan of this answers "could anything here need redaction?".
+# No match here guarantees no individual pattern matches either.
+_RX_ANY = re.compile(
+    r"[A-Za-z0-9_\-]{24,}"
+    r"|[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}"
+    r"|\d{4}-\d{4}-\d{4}-\d{4}"
+    r"|(?i:\b(?:password|secret|token)\b\s*[:=])"
+    r"|[A-Za-z0-9+/=]{40,}"
+)
+
+class ViolationType:
+    """Violation-type string constants.
+
+    Plain class attributes rather than an Enum: nothing here relies on enum
+    identity or iteration, and attribute reads skip the ``EnumMeta`` lookup
+    plus the ``.value`` hop on the refusal hot path.
+    """
     INJECTION_DETECTED = "injection_detected"
     BUDGET_EXCEEDED = "budget_exceeded"
     SYSTEM_ERROR = "system_error"
@@ -15,7 +178,17 @@ class ViolationType(str, Enum):
     RATE_LIMITED = "rate_limited"
     POLICY_VIOLATION = "policy_violation"
 
-@dataclass
+
+VIOLATION_VALUES: frozenset = frozenset((
+    ViolationType.INJECTION_DETECTED,
+    ViolationType.BUDGET_EXCEEDED,
+    ViolationType.SYSTEM_ERROR,
+    ViolationType.SCOPE_VIOLATION,
+    ViolationType.RATE_LIMITED,
+    ViolationType.POLICY_VIOLATION,
+))
+
+@dataclass(slots=True)
 class Refusal:
     status: str
     message: str
@@ -30,9 +203,85 @@ class Refusal:
     issued_at: str = ""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # asdict() would deep-copy every field (including the already-redacted
+        # context); a flat slot walk is enough since we just built the object.
+        return {f: getattr(self, f) for f in self.__slots__}
+
+
+@dataclass(slots=True, frozen=True)
+class RefusalContext:
+    """Typed, slotted alternative to the free-form context dict.
+
+    Callers on the hot path can construct this directly; every field read
+    during refusal generation becomes a fixed-offset attribute access instead
+    of a dict hash probe. Plain dicts remain fully supported.
+    """
+    user_id: Optional[str] = None
+    actor: Optional[str] = None
+    scope: str = "public"
+    required_scope: Optional[str] = None
+    violation_type: Optional[str] = None
+    rule_id: Optional[str] = None
+    intent: Optional[str] = None
+    text: Optional[str] = None
+    query: Optional[str] = None
+    retry_after: Optional[int] = None
+    rate_limit_reset_epoch: Optional[float] = None
+    budget_reset_epoch: Optional[float] = None
+
+
+class _LazyRefusal(dict):
+    """Refusal mapping that materializes the expensive ``_full`` payload
+    (ticket id, template rendering, suggestions) only on first access.
+
+    Callers that read just ``policy_reference``/``message``/``context`` never
+    pay for the rest.
+    """
+
+    __slots__ = ("_materialize",)
+
+    def __init__(self, base: Dict[str, Any], materialize: Any) -> None:
+        super().__init__(base)
+        self._materialize = materialize
+
+    def __missing__(self, key: str) -> Any:
+        if key == "_full" and self._materialize is not None:
+            full = self._materialize()
+            self["_full"] = full
+            self._materialize = None
+            return full
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+@functools.lru_cache(maxsize=4)
+def _format_bucket(bucket_seconds: int) -> str:
+    """Isoformat a bucket boundary; cached since every call within the same
+    bucket window (minutes at a time) asks for the same string."""
+    return datetime.fromtimestamp(bucket_seconds, tz=timezone.utc).isoformat()
+
+
+# Membership sets used on every refusal; frozen once at import instead of
+# rebuilding set literals per call.
+_RATE_LIKE = frozenset(("budget_exceeded", "rate_limited"))
+_INTERNAL_INTENTS = frozenset(("internal_info", "system_probe"))
+
 
 class CopperGround:
+    # Shared, import-time structures (see module constants above).
+    _templates = _FLAT_TEMPLATES
+    _fallback_messages = _FALLBACK_MESSAGES
+    _rx_token = _RX_TOKEN
+    _rx_email = _RX_EMAIL
+    _rx_card = _RX_CARD
+    _rx_secret = _RX_SECRET
+    _rx_blob = _RX_BLOB
+    _rx_any = _RX_ANY
+
     def __init__(
         self,
         policy_prefix: str = "SRA",
@@ -47,65 +296,57 @@ class CopperGround:
         self.locale = locale
         self.redact_context = redact_context
 
-        self._templates: Dict[str, Dict[str, str]] = {
-            "en": {
-                "injection_detected.message": "Request blocked: embedded instructions violate isolation policy.",
-                "injection_detected.remediation": "Please rephrase the request in plain language without meta-instructions, code comments, or requests to ignore rules.",
-                "injection_detected.escalation": "If you believe this is an error, contact {contact} and include reference {ticket_id}.",
-
-                "budget_exceeded.message": "Request blocked: privacy budget would be exceeded.",
-                "budget_exceeded.remediation": "Please wait {reset_time} before retrying or reduce the scope of the request.",
-                "budget_exceeded.escalation": "For higher budgets, contact {contact} with ticket {ticket_id}.",
-
-                "system_error.message": "Request blocked: internal error; safe refusal returned.",
-                "system_error.remediation": "Please try again. If the issue persists, attempt a simpler request.",
-                "system_error.escalation": "If failures continue, contact {contact} with ticket {ticket_id}.",
-
-                "scope_violation.message": "Request blocked: the requested operation requires {required_scope} authorization.",
-                "scope_violation.remediation": "Verify your credentials or request access to the required scope.",
-                "scope_violation.escalation": "For access review, contact {contact} with ticket {ticket_id}.",
-
-                "rate_limited.message": "Request blocked: rate limit exceeded.",
-                "rate_limited.remediation": "Please wait {retry_after}s before retrying, or slow down request frequency.",
-                "rate_limited.escalation": "If you need higher throughput, contact {contact} with ticket {ticket_id}.",
-
-                "policy_violation.message": "Request blocked: this action conflicts with active policy.",
-                "policy_violation.remediation": "Rewrite the request to avoid restricted data, capabilities, or formats.",
-                "policy_violation.escalation": "For a policy exception, contact {contact} with ticket {ticket_id}.",
+    def generate_refusal(
+        self,
+        violation_type: str,
+        context: "Dict[str, Any] | RefusalContext",
+        *,
+        fast: bool = False,
+        _redacted_context: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        v = self._coerce_violation(violation_type)
+        redacted = (_redacted_context if _redacted_context is not None
+                    else self._maybe_redact_context(context))
+
+        if fast:
+            # Lazy mode: only the cheap fields are computed eagerly; the
+            # "_full" payload is materialized on first access.
+            base = {
+                "policy_reference": self._policy_reference(v, self._rule_id(context)),
+                "message": self._message_for(v),
+                "context": redacted,
             }
+            return _LazyRefusal(base, functools.partial(self._materialize_full, v, context, redacted))
+
+        full = self._materialize_full(v, context, redacted)
+        return {
+            "policy_reference": full["policy_reference"],
+            "message": full["message"],
+            "context": redacted,
+            "_full": full,
         }
 
-        self._fallback_messages = {
-            "injection_detected": "Request blocked: embedded instructions violate isolation policy.",
-            "budget_exceeded": "Request blocked: privacy budget would be exceeded.",
-            "system_error": "Request blocked: internal error; safe refusal returned.",
-            "scope_violation": "Request blocked: missing required authorization scope.",
-            "rate_limited": "Request blocked: rate limit exceeded.",
-            "policy_violation": "Request blocked: policy violation.",
-        }
-
-        self._redact_patterns: List[Tuple[re.Pattern, str]] = [
-            (re.compile(r"\b[A-Za-z0-9_\-]{24,}\b"), "[REDACTED_TOKEN]"),
-            (re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}"), "[REDACTED_EMAIL]"),
-            (re.compile(r"\b\d{4}-\d{4}-\d{4}-\d{4}\b"), "[REDACTED_CARD]"),
-            (re.compile(r"(?i)\b(password|secret|token)\b\s*[:=]\s*\S+"), "[REDACTED_SECRET]"),
-        ]
-
-    def generate_refusal(self, violation_type: str, context: Dict[str, Any]) -> Dict[str, Any]:
-        v = self._coerce_violation(violation_type)
-        ticket_id = self._generate_ticket(context)
-        policy_ref = self._policy_reference(v, context)
-
-        msg = self._tpl(f"{v}.message", default=self._fallback_messages.get(v, "Request refused."))
-        remediation = self._tpl(f"{v}.remediation", default=None, vars={
-            "reset_time": self._format_reset_time(context),
-            "retry_after": self._extract_retry_after(context),
-            "required_scope": context.get("required_scope"),
-        })
-        escalation = self._tpl(f"{v}.escalation", default=None, vars={
-            "contact": self.escalation_contact,
-            "ticket_id": ticket_id,
-        })
+    def _materialize_full(
+        self, v: str, context: "Dict[str, Any] | RefusalContext", redacted: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        # One clock read per refusal; every time-derived field below reuses it.
+        now_ts = time.time()
+        ticket_id = self._generate_ticket(context, now_ts)
+        typed = isinstance(context, RefusalContext)
+
+        # Template rendering only depends on a handful of hashable scalars, so
+        # it is memoized (module-level cache); issued_at stays outside it.
+        msg, remediation, escalation, policy_ref = _render_static(
+            self.locale,
+            self.escalation_contact,
+            self.policy_prefix,
+            v,
+            self._rule_id(context),
+            context.required_scope if typed else context.get("required_scope"),
+            self._extract_retry_after(context, now_ts),
+            self._format_reset_time(context),
+            ticket_id,
+        )
 
         next_steps = self._suggest_alternatives(context)
 
@@ -118,59 +359,129 @@ class CopperGround:
             next_steps=next_steps or None,
             appeal_url=f"{self.appeal_base_url}/{ticket_id}",
             request_id=ticket_id,
-            retry_after_seconds=self._extract_retry_after(context),
-            context=self._maybe_redact_context(context),
-            issued_at=datetime.now(timezone.utc).isoformat(),
+            retry_after_seconds=self._extract_retry_after(context, now_ts),
+            context=redacted,
+            issued_at=datetime.fromtimestamp(now_ts, tz=timezone.utc).isoformat(),
         )
+        return refusal.to_dict()
+
+    def _message_for(self, violation: str) -> str:
+        entry = _COMPILED_TEMPLATES.get((self.locale, violation))
+        msg_part = entry[0] if entry is not None else None
+        return msg_part if msg_part is not None else self._fallback_messages.get(violation, "Request refused.")
+
+    # Separator for the batch redaction buffer. Contains whitespace on both
+    # sides of the sentinel so no redaction pattern (all are stopped by
+    # newlines, including the \S+ tail of the secret pattern) can match
+    # across two adjacent context strings.
+    _BATCH_SEP = "\n\x1e\n"
+
+    def generate_refusals_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Generate refusals for many (violation_type, context) pairs at once.
+
+        Redaction cost is amortized across the batch: every string leaf from
+        every context is joined into one buffer, each pattern family runs a
+        single sweep over it, and the results are scattered back before the
+        per-item refusals are assembled.
+        """
+        contexts = [ctx or {} for _, ctx in items]
+        if not self.redact_context:
+            return [self.generate_refusal(v, ctx) for (v, _), ctx in zip(items, contexts)]
+        redacted = self._batch_redact_contexts(contexts)
+        return [
+            self.generate_refusal(v, ctx, _redacted_context=red)
+            for (v, _), ctx, red in zip(items, contexts, redacted)
+        ]
 
-        base = {
-            "policy_reference": policy_ref,
-            "message": msg,
-            "context": refusal.context,
-        }
-        base["_full"] = refusal.to_dict()
-        return base
+    def _batch_redact_contexts(self, contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        copies: List[Dict[str, Any]] = []
+        slots: List[Tuple[Any, Any]] = []  # (container-in-copy, key) per leaf
+        leaves: List[str] = []
+        min_len = self._MIN_REDACTABLE_LEN
+        for ctx in contexts:
+            if not ctx:
+                copies.append({})
+                continue
+            root: Dict[str, Any] = {}
+            stack: List[Tuple[Any, Any, int]] = [(ctx, root, 0)]
+            while stack:
+                src, dst, depth = stack.pop()
+                child_depth = depth + 1
+                items = src.items() if isinstance(src, dict) else enumerate(src)
+                for key, value in items:
+                    if child_depth > 6:
+                        out: Any = "[REDACTED_DEPTH]"
+                    elif isinstance(value, dict):
+                        out = {}
+                        stack.append((value, out, child_depth))
+                    elif isinstance(value, list):
+                        out = []
+                        stack.append((value, out, child_depth))
+                    else:
+                        out = value
+                        if isinstance(value, str) and len(value) >= min_len:
+                            slots.append((dst, key))
+                            leaves.append(value)
+                    if isinstance(dst, dict):
+                        dst[key] = out
+                    else:
+                        dst.append(out)
+            copies.append(root)
+
+        if leaves:
+            joined = self._BATCH_SEP.join(leaves)
+            parts = self._redact_text(joined).split(self._BATCH_SEP)
+            if len(parts) != len(leaves):
+                # A redaction altered the separator (should not happen); fall
+                # back to the per-leaf path rather than misalign the scatter.
+                parts = [self._redact_text(s) for s in leaves]
+            for (container, key), new_value in zip(slots, parts):
+                container[key] = new_value
+        return copies
 
     def _coerce_violation(self, violation_type: str) -> str:
         vt = (violation_type or "").strip().lower()
-        if vt in {v.value for v in ViolationType}:
+        if vt in VIOLATION_VALUES:
             return vt
-        return ViolationType.POLICY_VIOLATION.value
+        return ViolationType.POLICY_VIOLATION
 
-    def _policy_reference(self, violation: str, context: Dict[str, Any]) -> str:
-        rule_id = str(context.get("rule_id") or "001")
+    def _policy_reference(self, violation: str, rule_id: str) -> str:
         return f"{self.policy_prefix}-{violation.upper()}-{rule_id}"
 
-    def _generate_ticket(self, context: Dict[str, Any]) -> str:
-        basis = {
-            "user": str(context.get("user_id") or context.get("actor") or "anon"),
-            "violation": str(context.get("violation_type") or ""),
-            "scope": str(context.get("scope") or ""),
-            "ts_bucket": self._time_bucket(minutes=5),
-        }
-        ns = uuid.UUID("12345678-1234-5678-1234-567812345678")
-        name = "|".join(f"{k}={v}" for k, v in sorted(basis.items()))
-        return str(uuid.uuid5(ns, name))
-
-    def _time_bucket(self, minutes: int = 5) -> str:
-        now = datetime.now(timezone.utc)
-        bucket = now - timedelta(minutes=now.minute % minutes, seconds=now.second, microseconds=now.microsecond)
-        return bucket.isoformat()
-
-    def _tpl(self, key: str, default: Optional[str], vars: Optional[Dict[str, Any]] = None) -> Optional[str]:
-        text = self._templates.get(self.locale, {}).get(key, default)
-        if text is None:
-            return None
-        if vars:
-            safe_vars = {k: v for k, v in (vars or {}).items() if v is not None}
-            try:
-                return text.format(**safe_vars)
-            except Exception:
-                return text
-        return text
-
-    def _format_reset_time(self, context: Dict[str, Any]) -> Optional[str]:
-        reset_epoch = context.get("budget_reset_epoch")
+    @staticmethod
+    def _rule_id(context: "Dict[str, Any] | RefusalContext") -> str:
+        if isinstance(context, RefusalContext):
+            return str(context.rule_id or "001")
+        return str(context.get("rule_id") or "001")
+
+    def _generate_ticket(self, context: "Dict[str, Any] | RefusalContext", now_ts: Optional[float] = None) -> str:
+        if isinstance(context, RefusalContext):
+            user = context.user_id or context.actor or "anon"
+            violation = context.violation_type or ""
+            scope = context.scope or ""
+        else:
+            user = str(context.get("user_id") or context.get("actor") or "anon")
+            violation = str(context.get("violation_type") or "")
+            scope = str(context.get("scope") or "")
+        ts_bucket = self._time_bucket(minutes=5, now_ts=now_ts)
+        # Key order is fixed at the alphabetical order the old
+        # sorted(dict.items()) produced, so existing ticket ids stay stable.
+        name = f"scope={scope}|ts_bucket={ts_bucket}|user={user}|violation={violation}"
+        # Equivalent to uuid.uuid5(ns, name) without per-call namespace parsing.
+        digest = hashlib.sha1(_NS_BYTES + name.encode("utf-8")).digest()
+        return str(uuid.UUID(bytes=digest[:16], version=5))
+
+    def _time_bucket(self, minutes: int = 5, now_ts: Optional[float] = None) -> str:
+        if now_ts is None:
+            now_ts = time.time()
+        # Integer floor to the bucket boundary; epoch is minute-aligned in UTC,
+        # so this matches the old datetime/timedelta arithmetic exactly.
+        bucket_ts = int(now_ts // (minutes * 60)) * (minutes * 60)
+        return _format_bucket(bucket_ts)
+
+    def _format_reset_time(self, context: "Dict[str, Any] | RefusalContext") -> Optional[str]:
+        reset_epoch = (context.budget_reset_epoch if isinstance(context, RefusalContext)
+                       else context.get("budget_reset_epoch"))
         if isinstance(reset_epoch, (int, float)) and reset_epoch > 0:
             try:
                 dt = datetime.fromtimestamp(reset_epoch, tz=timezone.utc)
@@ -179,43 +490,130 @@ class CopperGround:
                 return None
         return None
 
-    def _extract_retry_after(self, context: Dict[str, Any]) -> Optional[int]:
-        if isinstance(context.get("retry_after"), int):
-            return context["retry_after"]
-        reset_epoch = context.get("rate_limit_reset_epoch")
+    def _extract_retry_after(
+        self, context: "Dict[str, Any] | RefusalContext", now_ts: Optional[float] = None
+    ) -> Optional[int]:
+        if isinstance(context, RefusalContext):
+            retry_after = context.retry_after
+            reset_epoch = context.rate_limit_reset_epoch
+        else:
+            retry_after = context.get("retry_after")
+            reset_epoch = context.get("rate_limit_reset_epoch")
+        if isinstance(retry_after, int):
+            return retry_after
         if isinstance(reset_epoch, (int, float)) and reset_epoch > 0:
-            delta = int(reset_epoch - datetime.now(timezone.utc).timestamp())
+            delta = int(reset_epoch - (now_ts if now_ts is not None else time.time()))
             return max(delta, 0)
         return None
 
-    def _maybe_redact_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def _maybe_redact_context(self, context: "Dict[str, Any] | RefusalContext") -> Dict[str, Any]:
+        if isinstance(context, RefusalContext):
+            # Flatten the typed context to its populated fields for the
+            # response payload; redaction below applies as usual.
+            context = {f: getattr(context, f) for f in context.__slots__
+                       if getattr(context, f) is not None}
         if not self.redact_context or not context:
             return context or {}
         return self._redact_dict(context)
 
-    def _redact_dict(self, obj: Any, _depth: int = 0) -> Any:
-        if _depth > 6:
-            return "[REDACTED_DEPTH]"
-        if isinstance(obj, dict):
-            return {k: self._redact_dict(v, _depth + 1) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [self._redact_dict(v, _depth + 1) for v in obj]
+    # Shortest string any redaction pattern can match ("a@b.co" at 6 chars);
+    # shorter leaves are returned as-is without entering _redact_text.
+    _MIN_REDACTABLE_LEN = 6
+
+    def _redact_dict(self, obj: Any) -> Any:
         if isinstance(obj, str):
-            return self._redact_text(obj)
-        return obj
+            return self._redact_text(obj) if len(obj) >= self._MIN_REDACTABLE_LEN else obj
+        if not isinstance(obj, (dict, list)):
+            return obj
+
+        # Iterative worklist instead of recursion: deep contexts cost one
+        # stack entry per container rather than a Python frame per element.
+        # Each entry is (src, dst, depth, parent_dst, parent_key).
+        root: Any = {} if isinstance(obj, dict) else []
+        stack: List[Tuple[Any, Any, int, Any, Any]] = [(obj, root, 0, None, None)]
+        records: List[Tuple[Any, Any, Any, Any]] = []  # creation order
+        changed: Dict[int, bool] = {id(root): False}
+        min_len = self._MIN_REDACTABLE_LEN
+        while stack:
+            src, dst, depth, parent_dst, parent_key = stack.pop()
+            records.append((src, dst, parent_dst, parent_key))
+            child_depth = depth + 1
+            dirty = False
+            items = src.items() if isinstance(src, dict) else enumerate(src)
+            for key, value in items:
+                if child_depth > 6:
+                    out: Any = "[REDACTED_DEPTH]"
+                    dirty = True
+                elif isinstance(value, dict):
+                    out = {}
+                    changed[id(out)] = False
+                    stack.append((value, out, child_depth, dst, key))
+                elif isinstance(value, list):
+                    out = []
+                    changed[id(out)] = False
+                    stack.append((value, out, child_depth, dst, key))
+                elif isinstance(value, str) and len(value) >= min_len:
+                    out = self._redact_text(value)
+                    if out is not value:
+                        dirty = True
+                else:
+                    out = value
+                if isinstance(dst, dict):
+                    dst[key] = out
+                else:
+                    dst.append(out)
+            if dirty:
+                changed[id(dst)] = True
+
+        # Children are recorded after their parents, so a reverse sweep sees
+        # every container after all of its descendants: untouched subtrees are
+        # swapped back to the original objects (the copy is dropped) and the
+        # changed flag bubbles up. A fully clean context returns `obj` itself.
+        for src, dst, parent_dst, parent_key in reversed(records):
+            if changed[id(dst)]:
+                if parent_dst is not None:
+                    changed[id(parent_dst)] = True
+            elif parent_dst is not None:
+                parent_dst[parent_key] = src
+        return root if changed[id(root)] else obj
 
     def _redact_text(self, text: str) -> str:
+        # Single combined scan rejects the common clean string outright and
+        # preserves object identity so callers can detect "unchanged".
+        if self._rx_any.search(text) is None:
+            return text
+        # Cheap substring probes gate each regex family: most context strings
+        # carry no secrets, and `in`/len checks are far cheaper than a scan.
+        n = len(text)
         redacted = text
-        for pattern, repl in self._redact_patterns:
-            redacted = pattern.sub(repl, redacted)
-        redacted = re.sub(r"\b[A-Za-z0-9+/=]{40,}\b", "[REDACTED_BLOB]", redacted)
+        if n >= 24:
+            redacted = self._rx_token.sub("[REDACTED_TOKEN]", redacted)
+        if "@" in redacted:
+            redacted = self._rx_email.sub("[REDACTED_EMAIL]", redacted)
+        if n >= 19 and any(c.isdigit() for c in redacted):
+            redacted = self._rx_card.sub("[REDACTED_CARD]", redacted)
+        lower = redacted.lower()
+        if "password" in lower or "secret" in lower or "token" in lower:
+            redacted = self._rx_secret.sub("[REDACTED_SECRET]", redacted)
+        if n >= 40:
+            redacted = self._rx_blob.sub("[REDACTED_BLOB]", redacted)
         return redacted
 
-    def _suggest_alternatives(self, context: Dict[str, Any]) -> List[str]:
+    def _suggest_alternatives(self, context: "Dict[str, Any] | RefusalContext") -> List[str]:
         suggestions: List[str] = []
-        intent = str(context.get("intent") or "").lower()
-        scope = str(context.get("scope") or "public").lower()
-        text = str(context.get("text") or context.get("query") or "")
+        if isinstance(context, RefusalContext):
+            intent = (context.intent or "").lower()
+            scope = (context.scope or "public").lower()
+            text = context.text or context.query or ""
+            required_scope = context.required_scope
+            violation = context.violation_type
+        else:
+            intent = str(context.get("intent") or "").lower()
+            scope = str(context.get("scope") or "public").lower()
+            text = str(context.get("text") or context.get("query") or "")
+            required_scope = context.get("required_scope")
+            violation = context.get("violation_type")
+        text_lower = text.lower()
 
         if not text:
             suggestions.append("Describe your goal in plain language without including any embedded commands or code.")
@@ -224,15 +622,14 @@ class CopperGround:
             if len(text) > 500:
                 suggestions.append("Shorten the request or split it into smaller, focused questions.")
 
-        required_scope = context.get("required_scope")
         if required_scope and scope != required_scope:
             suggestions.append(f"Request access to the '{required_scope}' scope or proceed with information allowed under your current scope '{scope}'.")
 
-        if context.get("violation_type") in {"budget_exceeded", "rate_limited"}:
+        if violation in _RATE_LIKE:
             suggestions.append("Reduce the breadth of the request, or try again after the cooldown window.")
             suggestions.append("Where possible, ask for summaries or counts instead of raw data.")
 
-        if "internal" in text.lower() or intent in {"internal_info", "system_probe"}:
+        if "internal" in text_lower or intent in _INTERNAL_INTENTS:
             suggestions.append("Ask for public documentation or a high-level overview rather than internal specifics.")
 
         uniq: List[str] = []
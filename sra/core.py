@@ -16,7 +16,18 @@ Notes
 
 from __future__ import annotations
 
+import array
+import atexit
+import functools
+import hashlib
+import inspect
+import math
+import queue
+import sys
+import threading
 import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List, Tuple
 
 from .s1_detector import S1Detector
@@ -26,6 +37,167 @@ from .audit_logger import AuditLogger
 from .budget_tracker import BudgetTracker
 
 
+# Bounded LRU for S1 classification results (keyed by input digest + history).
+_CLS_CACHE_MAX = 1024
+
+# Risk levels that route to a hard block (single source of truth for the
+# dispatch table below; frozenset so membership tests allocate nothing).
+_BLOCK_RISKS = frozenset(("high", "critical"))
+
+
+@functools.lru_cache(maxsize=4096)
+def _privacy_cost(input_len: int, confidence: float, risk_level: str) -> float:
+    """Pure ε-cost heuristic, memoized on its three scalar inputs."""
+    base = 0.10
+    if input_len > 200:
+        base *= 1.5
+    if confidence < 0.8:
+        base *= 1.2
+    if risk_level == "medium":
+        base *= 1.1
+    # Cap and round for stable UI
+    return round(min(base, 0.5), 3)
+
+
+@dataclass(slots=True)
+class _Ctx:
+    """Per-request values derived from the classification exactly once in
+    process_request, so handlers stop re-walking the classification dict."""
+    pressure: float
+    risk_level: str
+    epsilon_cost: float
+
+
+# Sentinel distinguishing "field never set on this path" from an explicit None,
+# so `"epsilon_cost" in result` keeps the old per-path dict semantics.
+_UNSET: Any = object()
+
+
+@dataclass(slots=True)
+class SRAResponse:
+    """Slotted response record returned by the `_handle_*` paths.
+
+    Behaves like the dicts it replaces (`[]`, ``.get``, ``in``, iteration over
+    keys) but allocates one fixed-layout object instead of a 7–9-key dict per
+    request. Fields left at ``_UNSET`` are invisible to the mapping protocol.
+    """
+
+    status: str
+    action: str
+    response: Any
+    latency_ms: float
+    classification: Any = _UNSET
+    s1_pressure_score: Any = _UNSET
+    epsilon_cost: Any = _UNSET
+    budget_remaining: Any = _UNSET
+    retry_after: Any = _UNSET
+
+    def __post_init__(self) -> None:
+        # Downstream consumers json.dump responses wholesale (eval scripts,
+        # Streamlit session state), so a Classification record flattens to
+        # its dict form (a fresh copy per call) at this boundary.
+        cls = self.classification
+        if cls is not _UNSET and hasattr(cls, "to_dict"):
+            self.classification = cls.to_dict()
+
+    # --- dict-compat shim (callers index with [], .get and `in`) ---
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            v = getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+        if v is _UNSET:
+            raise KeyError(key)
+        return v
+
+    def get(self, key: str, default: Any = None) -> Any:
+        v = getattr(self, key, _UNSET)
+        return default if v is _UNSET else v
+
+    def __contains__(self, key: str) -> bool:
+        return getattr(self, key, _UNSET) is not _UNSET
+
+    def keys(self) -> List[str]:
+        return [f for f in self.__slots__ if getattr(self, f) is not _UNSET]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(k, getattr(self, k)) for k in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize a plain dict at the API boundary (JSON, Streamlit state)."""
+        return dict(self.items())
+
+
+class _AuditQueue:
+    """Single background writer that takes audit entries off the request path.
+
+    Entries are coalesced into batches (up to ``_BATCH`` or a 5 ms lull)
+    before hitting the hash-chained logger, so request latency no longer
+    includes the write syscall. One worker thread keeps the chain ordering
+    identical to the old synchronous path.
+    """
+
+    _BATCH = 64
+
+    def __init__(self, audit: AuditLogger) -> None:
+        self._audit = audit
+        # Batched append when the logger supports it (one write per batch).
+        self._batch_log = getattr(audit, "log_decisions", None)
+        self._q: "queue.Queue[Tuple[Optional[str], str, Optional[Dict[str, Any]], Optional[threading.Event]]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+        # atexit handlers run before daemon threads are killed, so entries
+        # still queued when the interpreter exits get written instead of
+        # silently dropped (callers rarely remember to flush themselves).
+        atexit.register(self.flush)
+
+    def put(
+        self,
+        decision: str,
+        reason: str,
+        extra: Optional[Dict[str, Any]] = None,
+        done: Optional[threading.Event] = None,
+    ) -> None:
+        self._q.put((decision, reason, extra, done))
+
+    def flush(self) -> None:
+        """Block until everything enqueued so far has been written."""
+        done = threading.Event()
+        self._q.put((None, "", None, done))  # sentinel: no write, just signal
+        done.wait()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._q.get()]
+            try:
+                while len(batch) < self._BATCH:
+                    batch.append(self._q.get(timeout=0.005))
+            except queue.Empty:
+                pass
+            writes = [(d, r, e) for d, r, e, _done in batch if d is not None]
+            if writes:
+                try:
+                    if self._batch_log is not None:
+                        self._batch_log(writes)
+                    else:
+                        for decision, reason, extra in writes:
+                            self._audit.log_decision(decision=decision, reason=reason, extra=extra)
+                except Exception as e:
+                    # Must not take down the worker, but the old synchronous
+                    # path raised — never turn write failures into silent loss.
+                    print(
+                        f"audit write failed, {len(writes)} entry(ies) lost: {e}",
+                        file=sys.stderr,
+                    )
+            for _d, _r, _e, done in batch:
+                if done is not None:
+                    done.set()
+
+
 class SRACore:
     """Main SRA processing engine integrating S1/S2 + budgets + audit."""
 
@@ -43,6 +215,18 @@ class SRACore:
         self.templates = self._init_templates(config_path)
         self.copper_ground = CopperGround()
         self.audit = self._init_audit(config_path)
+        self._audit_queue = _AuditQueue(self.audit)
+
+        # Probe the classifier signature once instead of try/except TypeError
+        # on every request (exception raises are expensive in CPython).
+        try:
+            accepts_history = len(inspect.signature(self.detector.classify).parameters) >= 2
+        except (TypeError, ValueError):
+            accepts_history = True
+        if accepts_history:
+            self._classify = self.detector.classify
+        else:
+            self._classify = lambda text, history: self.detector.classify(text)
 
         # Budgets / rate (S3)
         # Requires the upgraded BudgetTracker with QPM window support.
@@ -52,9 +236,65 @@ class SRACore:
             window_seconds=window_seconds,
         )
 
-        # Telemetry
-        self.requests_processed = 0
-        self.attacks_blocked = 0
+        # Inline QPM token bucket: the sliding window lives here as a deque of
+        # monotonic timestamps, so the hot path never dispatches into the
+        # tracker (which keeps ε bookkeeping and snapshot shape only).
+        self._qpm_limit = int(qpm_limit) if qpm_limit else 0
+        self._qpm_window = max(int(window_seconds), 1)
+        self._qpm_times: "deque[float]" = deque()
+
+        # S1 result cache: identical prompts (retries, automated probes) skip
+        # the full pattern-match pass. Pure memoization — safe to evict.
+        self._cls_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
+        # Risk → handler dispatch; one dict lookup replaces the if-chain in the
+        # router (all handlers share the same call shape).
+        self._risk_dispatch = {risk: self._handle_block for risk in _BLOCK_RISKS}
+        self._risk_dispatch["medium"] = self._handle_template
+        self._risk_dispatch["low"] = self._handle_allow
+
+        # Budget snapshot cache: snapshot() builds a fresh dict, but the state
+        # only changes on spend / window ticks, so rebuild only when dirty.
+        self._budget_snap_cache: Optional[Dict[str, Any]] = None
+        self._budget_dirty = True
+
+        # Static portions of the refusal contexts built on every rate-limited /
+        # budget-exhausted block; handlers overlay only the per-request fields.
+        self._rl_refusal_stub = {"violation_type": "rate_limited"}
+        self._be_refusal_stub = {"violation_type": "budget_exceeded", "budget_reset_epoch": None}
+
+        # Telemetry: [requests_processed, attacks_blocked] packed in one
+        # fixed-width array (publishable to a monitoring thread without locks),
+        # with the derived block rate cached between counter changes.
+        self._ctrs = array.array("Q", [0, 0])
+        self._block_rate_val = 0.0
+        self._block_rate_n = 0
+
+    # Counter properties keep the public attribute contract (demo UI both
+    # reads and assigns these) while the storage stays in the packed array.
+    @property
+    def requests_processed(self) -> int:
+        return self._ctrs[0]
+
+    @requests_processed.setter
+    def requests_processed(self, value: int) -> None:
+        self._ctrs[0] = int(value)
+
+    @property
+    def attacks_blocked(self) -> int:
+        return self._ctrs[1]
+
+    @attacks_blocked.setter
+    def attacks_blocked(self, value: int) -> None:
+        self._ctrs[1] = int(value)
+        self._block_rate_n = -1  # force recompute on next read
+
+    def _block_rate(self) -> float:
+        n = self._ctrs[0]
+        if n != self._block_rate_n:
+            self._block_rate_val = self._ctrs[1] / max(n, 1)
+            self._block_rate_n = n
+        return self._block_rate_val
 
     # ------------------------------ Public API ------------------------------ #
 
@@ -63,7 +303,23 @@ class SRACore:
         user_input: str,
         user_scope: str = "public",
         context_history: Optional[List[str]] = None,
-    ) -> Dict[str, Any]:
+        *,
+        wait_audit: bool = False,
+    ) -> SRAResponse:
+        """Process one request. With ``wait_audit=True`` the call blocks until
+        the request's audit entry has been written (durability parity with the
+        old synchronous logger)."""
+        result = self._process_request(user_input, user_scope, context_history)
+        if wait_audit:
+            self.flush_audit()
+        return result
+
+    def _process_request(
+        self,
+        user_input: str,
+        user_scope: str = "public",
+        context_history: Optional[List[str]] = None,
+    ) -> SRAResponse:
         """
         Returns:
           {
@@ -78,8 +334,8 @@ class SRACore:
             retry_after: Optional[int]  # for rate‑limited
           }
         """
-        t0 = time.time()
-        self.requests_processed += 1
+        t0 = time.perf_counter_ns()
+        self._ctrs[0] += 1
 
         # --- S3 pre‑gates: rate limit & hard ε exhaustion (cheap checks) ---
         ok, retry_after = self._rate_gate()
@@ -89,50 +345,59 @@ class SRACore:
         if self.budget.get_remaining() <= 0.0:
             return self._handle_budget_exhausted(user_input, user_scope, t0)
 
-        # --- S1: classify (pattern / light semantics) ---
-        try:
+        # --- S1: classify (pattern / light semantics), LRU-cached by input ---
+        cache_key = (
+            hashlib.blake2b(user_input.encode("utf-8"), digest_size=16).digest(),
+            tuple(context_history or ()),
+        )
+        cached = self._cls_cache.get(cache_key)
+        if cached is not None:
+            self._cls_cache.move_to_end(cache_key)
+            classification = cached  # frozen Classification; to_dict() copies
+        else:
             try:
-                classification = self.detector.classify(user_input, context_history or [])
-            except TypeError:
-                classification = self.detector.classify(user_input)
-        except Exception as e:
-            # Defensive: S1 failure becomes safe refusal
-            return self._handle_system_error(user_input, user_scope, t0, str(e))
+                classification = self._classify(user_input, context_history or [])
+            except Exception as e:
+                # Defensive: S1 failure becomes safe refusal
+                return self._handle_system_error(user_input, user_scope, t0, str(e))
+            self._cls_cache[cache_key] = classification
+            if len(self._cls_cache) > _CLS_CACHE_MAX:
+                self._cls_cache.popitem(last=False)
 
         # Router (demo): high/critical → block; medium → template; PII leak → notice/template
         risk = str(classification.get("risk_level", "low")).lower()
         pressure = self._extract_pressure(classification)
+        ctx = _Ctx(
+            pressure=pressure,
+            risk_level=risk,
+            epsilon_cost=self._calculate_privacy_cost(user_input, classification),
+        )
 
         # PII notice path (mirrors policy rule: pii_leak ≥ 1 and pressure ≥ ~0.35)
         pii_count = self._count_pattern_matches(classification, "pii_leak")
         if pii_count >= 1 and (pressure if isinstance(pressure, (int, float)) else 0.0) >= 0.35:
             result = self._handle_template(
-                user_input, user_scope, classification, t0, template_category="pii_notice"
+                user_input, user_scope, classification, t0, ctx, template_category="pii_notice"
             )
             self._notify_request_issued()  # QPM window tick
             return result
 
-        if risk in {"high", "critical"}:
-            result = self._handle_block(user_input, classification, t0)
-            self._notify_request_issued()
-            return result
-
-        if risk == "medium":
-            result = self._handle_template(user_input, user_scope, classification, t0)
-            self._notify_request_issued()
-            return result
-
-        # Low risk: allow
-        result = self._handle_allow(user_input, user_scope, classification, t0)
+        handler = self._risk_dispatch.get(risk, self._handle_allow)
+        result = handler(user_input, user_scope, classification, t0, ctx)
         self._notify_request_issued()
         return result
 
+    def flush_audit(self) -> None:
+        """Block until all pending audit entries are on disk."""
+        self._audit_queue.flush()
+
     def get_stats(self) -> Dict[str, Any]:
-        snap = self.budget.snapshot()
+        self.flush_audit()  # entry counts reflect everything processed so far
+        snap = self._budget_snapshot()
         return {
-            "requests_processed": self.requests_processed,
-            "attacks_blocked": self.attacks_blocked,
-            "block_rate": self.attacks_blocked / max(self.requests_processed, 1),
+            "requests_processed": self._ctrs[0],
+            "attacks_blocked": self._ctrs[1],
+            "block_rate": self._block_rate(),
             "budget_remaining": snap.get("epsilon_remaining", self.budget.get_remaining()),
             "audit_entries": self.audit.get_entry_count(),
             "qpm_limit": snap.get("qpm_limit"),
@@ -140,9 +405,44 @@ class SRACore:
             "qpm_requests_in_window": snap.get("request_count_current_window"),
         }
 
+    def _audit_enqueue(
+        self, decision: str, reason: str, extra: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self._audit_queue.put(decision, reason, extra)
+
+    @staticmethod
+    def _make_extra(
+        *,
+        input: str,
+        risk_level: str,
+        pressure: float,
+        latency: float,
+        snap: Dict[str, Any],
+        classification: Optional[Any] = None,
+        **more: Any,
+    ) -> Dict[str, Any]:
+        """One place that knows the audit `extra` shape, instead of six inline
+        dict literals; paths without a classification simply omit the key."""
+        extra: Dict[str, Any] = {
+            "input": input,
+            "risk_level": risk_level,
+            "s1_pressure_score": pressure,
+            "latency_ms": latency,
+        }
+        if classification is not None:
+            # Classification records materialize here, at the JSON boundary
+            if hasattr(classification, "to_dict"):
+                classification = classification.to_dict()
+            extra["classification"] = classification
+        extra.update(more)
+        extra["budget_snapshot"] = snap
+        return extra
+
     # ------------------------------ Handlers -------------------------------- #
 
-    def _handle_block(self, user_input: str, classification: Dict[str, Any], t0: float) -> Dict[str, Any]:
+    def _handle_block(
+        self, user_input: str, user_scope: str, classification: Dict[str, Any], t0: float, ctx: _Ctx
+    ) -> SRAResponse:
         refusal = self.copper_ground.generate_refusal(
             "injection_detected",
             {
@@ -150,34 +450,34 @@ class SRACore:
                     "reason",
                     (classification.get("reasons", ["pattern match"]) or ["pattern match"])[0],
                 ),
-                "risk_level": classification.get("risk_level", "high"),
+                "risk_level": ctx.risk_level,
                 "violation_type": "injection_detected",
                 "text": user_input,
             },
         )
         latency = self._lat_ms(t0)
-        self.attacks_blocked += 1
+        self._ctrs[1] += 1
 
-        self.audit.log_decision(
+        self._audit_enqueue(
             decision="BLOCKED",
             reason="High risk - policy block",
-            extra={
-                "input": user_input,
-                "risk_level": classification.get("risk_level", "high"),
-                "s1_pressure_score": self._extract_pressure(classification),
-                "latency_ms": latency,
-                "classification": classification,
-                "budget_snapshot": self.budget.snapshot(),
-            },
+            extra=self._make_extra(
+                input=user_input,
+                risk_level=ctx.risk_level,
+                pressure=ctx.pressure,
+                latency=latency,
+                snap=self._budget_snapshot(),
+                classification=classification,
+            ),
+        )
+        return SRAResponse(
+            status="blocked",
+            action="BLOCKED",
+            response=refusal,
+            latency_ms=latency,
+            classification=classification,
+            s1_pressure_score=ctx.pressure,
         )
-        return {
-            "status": "blocked",
-            "action": "BLOCKED",
-            "response": refusal,
-            "latency_ms": latency,
-            "classification": classification,
-            "s1_pressure_score": self._extract_pressure(classification),
-        }
 
     def _handle_template(
         self,
@@ -185,9 +485,10 @@ class SRACore:
         user_scope: str,
         classification: Dict[str, Any],
         t0: float,
+        ctx: _Ctx,
         *,
         template_category: Optional[str] = None,
-    ) -> Dict[str, Any]:
+    ) -> SRAResponse:
         """
         Medium-risk (or PII-notice) path: produce a constrained, template-based response.
         """
@@ -205,116 +506,116 @@ class SRACore:
 
         # Accounting
         latency = self._lat_ms(t0)
-        epsilon_cost = self._calculate_privacy_cost(user_input, classification)
+        epsilon_cost = ctx.epsilon_cost
 
         # Prevent overspend of ε
         if epsilon_cost > max(0.0, self.budget.get_remaining()):
             return self._handle_budget_exhausted(user_input, user_scope, t0, attempted_cost=epsilon_cost)
 
         # Spend ε and write audit
-        self.budget.spend(epsilon_cost)
-        self.audit.log_decision(
+        self._spend(epsilon_cost)
+        self._audit_enqueue(
             decision="TEMPLATE",
             reason="Medium risk - template mode",
-            extra={
-                "input": user_input,
-                "risk_level": classification.get("risk_level", "medium"),
-                "s1_pressure_score": self._extract_pressure(classification),
-                "latency_ms": latency,
-                "template_used": category,
-                "classification": classification,
-                "epsilon_cost": epsilon_cost,
-                "budget_snapshot": self.budget.snapshot(),
-            },
+            extra=self._make_extra(
+                input=user_input,
+                risk_level=ctx.risk_level,
+                pressure=ctx.pressure,
+                latency=latency,
+                snap=self._budget_snapshot(),
+                classification=classification,
+                template_used=category,
+                epsilon_cost=epsilon_cost,
+            ),
         )
 
-        return {
-            "status": "template",
-            "action": "TEMPLATE",
-            "response": response,
-            "latency_ms": latency,
-            "epsilon_cost": epsilon_cost,
-            "budget_remaining": self.budget.get_remaining(),
-            "classification": classification,
-            "s1_pressure_score": self._extract_pressure(classification),
-        }
+        return SRAResponse(
+            status="template",
+            action="TEMPLATE",
+            response=response,
+            latency_ms=latency,
+            epsilon_cost=epsilon_cost,
+            budget_remaining=self.budget.get_remaining(),
+            classification=classification,
+            s1_pressure_score=ctx.pressure,
+        )
 
     def _handle_allow(
-        self, user_input: str, user_scope: str, classification: Dict[str, Any], t0: float
-    ) -> Dict[str, Any]:
+        self, user_input: str, user_scope: str, classification: Dict[str, Any], t0: float, ctx: _Ctx
+    ) -> SRAResponse:
         content = self._draft_safe_summary(user_input, user_scope)
         response = {"message": f"Based on public sources: {content}"}
 
         latency = self._lat_ms(t0)
-        epsilon_cost = self._calculate_privacy_cost(user_input, classification)
+        epsilon_cost = ctx.epsilon_cost
 
         if epsilon_cost > max(0.0, self.budget.get_remaining()):
             return self._handle_budget_exhausted(user_input, user_scope, t0, attempted_cost=epsilon_cost)
 
-        self.budget.spend(epsilon_cost)
+        self._spend(epsilon_cost)
 
-        self.audit.log_decision(
+        self._audit_enqueue(
             decision="ALLOWED",
             reason="Low risk - allowed",
-            extra={
-                "input": user_input,
-                "risk_level": classification.get("risk_level", "low"),
-                "s1_pressure_score": self._extract_pressure(classification),
-                "latency_ms": latency,
-                "classification": classification,
-                "epsilon_cost": epsilon_cost,
-                "budget_snapshot": self.budget.snapshot(),
-            },
+            extra=self._make_extra(
+                input=user_input,
+                risk_level=ctx.risk_level,
+                pressure=ctx.pressure,
+                latency=latency,
+                snap=self._budget_snapshot(),
+                classification=classification,
+                epsilon_cost=epsilon_cost,
+            ),
+        )
+        return SRAResponse(
+            status="allowed",
+            action="ALLOWED",
+            response=response,
+            latency_ms=latency,
+            epsilon_cost=epsilon_cost,
+            budget_remaining=self.budget.get_remaining(),
+            classification=classification,
+            s1_pressure_score=ctx.pressure,
         )
-        return {
-            "status": "allowed",
-            "action": "ALLOWED",
-            "response": response,
-            "latency_ms": latency,
-            "epsilon_cost": epsilon_cost,
-            "budget_remaining": self.budget.get_remaining(),
-            "classification": classification,
-            "s1_pressure_score": self._extract_pressure(classification),
-        }
 
     def _handle_rate_limited(
         self, user_input: str, user_scope: str, t0: float, retry_after: Optional[int]
-    ) -> Dict[str, Any]:
+    ) -> SRAResponse:
         latency = self._lat_ms(t0)
         refusal = self.copper_ground.generate_refusal(
             "rate_limited",
             {
+                **self._rl_refusal_stub,
                 "text": user_input,
                 "scope": user_scope,
                 "retry_after": retry_after,
                 "rate_limit_reset_epoch": time.time() + (retry_after or 0),
-                "violation_type": "rate_limited",
             },
         )
-        self.attacks_blocked += 1
-        self.audit.log_decision(
+        self._ctrs[1] += 1
+        self._audit_enqueue(
             decision="BLOCKED",
             reason="Rate limit exceeded",
-            extra={
-                "input": user_input,
-                "risk_level": "low",
-                "s1_pressure_score": 0.0,
-                "latency_ms": latency,
-                "retry_after": retry_after,
-                "budget_snapshot": self.budget.snapshot(),
-            },
+            extra=self._make_extra(
+                input=user_input,
+                risk_level="low",
+                pressure=0.0,
+                latency=latency,
+                snap=self._budget_snapshot(),
+                retry_after=retry_after,
+            ),
         )
         # Do NOT count ε spend on a rate‑limited block.
         self._notify_request_issued()  # still consumes a QPM slot
-        return {
-            "status": "blocked",
-            "action": "BLOCKED",
-            "response": refusal,
-            "latency_ms": latency,
-            "retry_after": retry_after,
-            "classification": {"risk_level": "low", "pressure": 0.0, "reasons": ["rate_limited"]},
-            "s1_pressure_score": 0.0,
-        }
+        return SRAResponse(
+            status="blocked",
+            action="BLOCKED",
+            response=refusal,
+            latency_ms=latency,
+            retry_after=retry_after,
+            classification={"risk_level": "low", "pressure": 0.0, "reasons": ["rate_limited"]},
+            s1_pressure_score=0.0,
+        )
 
     def _handle_budget_exhausted(
         self,
@@ -323,77 +624,84 @@ class SRACore:
         t0: float,
         *,
         attempted_cost: Optional[float] = None,
-    ) -> Dict[str, Any]:
+    ) -> SRAResponse:
         latency = self._lat_ms(t0)
         refusal = self.copper_ground.generate_refusal(
             "budget_exceeded",
             {
+                **self._be_refusal_stub,  # budget_reset_epoch stays None until periodic refill exists
                 "text": user_input,
                 "scope": user_scope,
-                "violation_type": "budget_exceeded",
-                "budget_reset_epoch": None,  # could be wired if you implement periodic refill
                 "attempted_cost": attempted_cost,
             },
         )
-        self.attacks_blocked += 1
-        self.audit.log_decision(
+        self._ctrs[1] += 1
+        self._audit_enqueue(
             decision="BLOCKED",
             reason="Privacy budget exhausted",
-            extra={
-                "input": user_input,
-                "risk_level": "low",
-                "s1_pressure_score": 0.0,
-                "latency_ms": latency,
-                "attempted_cost": attempted_cost,
-                "budget_snapshot": self.budget.snapshot(),
-            },
+            extra=self._make_extra(
+                input=user_input,
+                risk_level="low",
+                pressure=0.0,
+                latency=latency,
+                snap=self._budget_snapshot(),
+                attempted_cost=attempted_cost,
+            ),
+        )
+        return SRAResponse(
+            status="blocked",
+            action="BLOCKED",
+            response=refusal,
+            latency_ms=latency,
+            classification={"risk_level": "low", "pressure": 0.0, "reasons": ["budget_exceeded"]},
+            s1_pressure_score=0.0,
         )
-        return {
-            "status": "blocked",
-            "action": "BLOCKED",
-            "response": refusal,
-            "latency_ms": latency,
-            "classification": {"risk_level": "low", "pressure": 0.0, "reasons": ["budget_exceeded"]},
-            "s1_pressure_score": 0.0,
-        }
 
-    def _handle_system_error(self, user_input: str, user_scope: str, t0: float, err: str) -> Dict[str, Any]:
+    def _handle_system_error(self, user_input: str, user_scope: str, t0: float, err: str) -> SRAResponse:
         latency = self._lat_ms(t0)
         refusal = self.copper_ground.generate_refusal("system_error", {"error": err, "text": user_input})
-        self.attacks_blocked += 1
-        self.audit.log_decision(
+        self._ctrs[1] += 1
+        self._audit_enqueue(
             decision="ERROR",
             reason=f"System error: {err}",
             extra={
                 "input": user_input,
                 "latency_ms": latency,
                 "scope": user_scope,
-                "budget_snapshot": self.budget.snapshot(),
+                "budget_snapshot": self._budget_snapshot(),
             },
         )
-        return {"status": "error", "action": "ERROR", "response": refusal, "latency_ms": latency}
+        return SRAResponse(status="error", action="ERROR", response=refusal, latency_ms=latency)
 
     # ------------------------------ Helpers --------------------------------- #
 
-    @staticmethod
-    def _safe_prompt_echo(user_input: str, max_len: int = 160) -> str:
-        s = (user_input or "").strip().replace("\n", " ")
-        return f"request about: {s[: max_len - 1] + '…' if len(s) > max_len else s}"
+    # Single-pass C-level whitespace folding for prompt echoes (translate beats
+    # chained .replace() calls when newlines are absent, the common case).
+    _NL_TRANS = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+    @classmethod
+    def _safe_prompt_echo(cls, user_input: str, max_len: int = 160) -> str:
+        s = (user_input or "").strip().translate(cls._NL_TRANS)
+        if len(s) > max_len:
+            return f"request about: {s[: max_len - 1]}…"
+        return f"request about: {s}"
 
     @staticmethod
     def _draft_safe_summary(user_input: str, user_scope: str, max_len: int = 80) -> str:
-        topic = (user_input or "").strip().split("\n", 1)[0]
+        # First line only — partition avoids the list allocation of split().
+        topic = (user_input or "").strip().partition("\n")[0]
         if len(topic) > max_len:
             topic = topic[: max_len - 1] + "…"
         return f"summary for '{topic}' (scope={user_scope})"
 
     @staticmethod
     def _extract_pressure(classification: Dict[str, Any]) -> float:
-        # Prefer 'pressure'; fall back to 'pressure_score' or 'confidence'
+        # Prefer 'pressure'; fall back to 'pressure_score' or 'confidence'.
+        # Returned raw: rounding is presentation work, done by the UI layer.
         for k in ("pressure", "pressure_score", "confidence"):
             v = classification.get(k)
             try:
-                return round(float(v), 3)
+                return float(v)
             except Exception:
                 continue
         return 0.0
@@ -401,14 +709,22 @@ class SRACore:
     @staticmethod
     def _count_pattern_matches(classification: Dict[str, Any], category: str) -> int:
         try:
-            matches = classification.get("features", {}).get("pattern_matches", []) or []
+            features = classification.get("features", {}) or {}
+            counts = features.get("category_counts")
+            if counts is not None:
+                return int(counts.get(category.lower(), 0))
+            # Classifier without category_counts: fall back to the full walk.
+            matches = features.get("pattern_matches", []) or []
             return sum(1 for m in matches if str(m.get("category", "")).lower() == category.lower())
         except Exception:
             return 0
 
     @staticmethod
-    def _lat_ms(t0: float) -> float:
-        return round((time.time() - t0) * 1000.0, 1)
+    def _lat_ms(t0: int) -> float:
+        # t0 is from time.perf_counter_ns(): monotonic, no wall-clock syscall.
+        # Integer division to 0.1 ms then one cheap float divide — same 1-decimal
+        # precision the old round() produced.
+        return (time.perf_counter_ns() - t0) // 100_000 / 10
 
     # Component initializers (defensive to ctor signatures)
     @staticmethod
@@ -438,31 +754,47 @@ class SRACore:
         """
         Returns (ok, retry_after_seconds). If not ok, request should be blocked as rate-limited.
         """
-        try:
-            ok, retry_after = self.budget.can_issue_request()
-            return bool(ok), (int(retry_after) if retry_after is not None else None)
-        except AttributeError:
-            # Backward compatibility with the simple BudgetTracker (no QPM support)
+        if not self._qpm_limit:
             return True, None
+        now = time.monotonic()
+        times = self._qpm_times
+        cutoff = now - self._qpm_window
+        while times and times[0] < cutoff:
+            times.popleft()
+        if len(times) < self._qpm_limit:
+            return True, None
+        return False, max(0, int(math.ceil(times[0] + self._qpm_window - now)))
 
     def _notify_request_issued(self) -> None:
-        try:
-            self.budget.notify_request_issued()
-        except AttributeError:
-            pass  # simple tracker has no window accounting
+        if self._qpm_limit:
+            self._qpm_times.append(time.monotonic())
+            self._budget_dirty = True
+
+    def _spend(self, epsilon_cost: float) -> None:
+        self.budget.spend(epsilon_cost)
+        self._budget_dirty = True
+
+    def _budget_snapshot(self) -> Dict[str, Any]:
+        """Cached view of budget state; rebuilt only after a spend or QPM tick.
+
+        The window fields are overlaid from the inline bucket, which is the
+        authoritative rate-limit state now that the tracker no longer sees
+        per-request notifications."""
+        if self._budget_dirty or self._budget_snap_cache is None:
+            snap = self.budget.snapshot()
+            ok, retry = self._rate_gate()
+            snap["request_count_current_window"] = len(self._qpm_times)
+            snap["can_request"] = ok
+            snap["retry_after_seconds"] = retry
+            self._budget_snap_cache = snap
+            self._budget_dirty = False
+        return self._budget_snap_cache
 
     # Privacy cost: light, deterministic heuristic for the demo
     def _calculate_privacy_cost(self, user_input: str, classification: Dict[str, Any]) -> float:
-        base = 0.10
-        if len(user_input or "") > 200:
-            base *= 1.5
         try:
             conf = float(classification.get("confidence", 1.0))
         except Exception:
             conf = 1.0
-        if conf < 0.8:
-            base *= 1.2
-        if str(classification.get("risk_level", "low")).lower() == "medium":
-            base *= 1.1
-        # Cap and round for stable UI
-        return round(min(base, 0.5), 3)
\ No newline at end of file
+        risk = str(classification.get("risk_level", "low")).lower()
+        return _privacy_cost(len(user_input or ""), conf, risk)
\ No newline at end of file
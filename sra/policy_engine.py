@@ -1,10 +1,173 @@
 # SPDX-License-Identifier: MIT
 # Minimal policy engine for SRA demo
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+import ast
+import functools
+import operator
 import os
+import re
 import yaml
 
+# Context keys exposed to rule conditions, longest first so token rewriting
+# never clips a key that is a prefix of another.
+_CTX_KEYS = (
+    "rate_limit.queries_per_minute_exceeded",
+    "budget.remaining_epsilon",
+    "query.required_scope",
+    "s1.risk_level",
+    "s1.pressure",
+    "user.scope",
+)
+
+
+def _dig(root: Dict[str, Any], dotted: str) -> Any:
+    node: Any = root
+    for p in dotted.split("."):
+        node = node[p]
+    return node
+
+
+# One pass each over the condition string: dotted bands.* references and ctx
+# tokens (alternation ordered longest-first by _CTX_KEYS, so a key that is a
+# prefix of another can never clip it).
+_BANDS_RE = re.compile(r"bands(?:\.[A-Za-z_]\w*)+")
+_CTX_RE = re.compile("|".join(re.escape(k) for k in _CTX_KEYS))
+
+
+_CMP_OPS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+def _compile_predicate(expr: str) -> Callable[[Dict[str, Any]], bool]:
+    """Walk the expression AST into nested closures.
+
+    Evaluation is then plain Python calls and comparisons — no eval() frame
+    setup per rule per request — and unsupported syntax fails loudly at load
+    time instead of silently routing to False.
+    """
+    tree = ast.parse(expr, mode="eval")
+
+    def build(node: ast.AST) -> Callable[[Dict[str, Any]], Any]:
+        if isinstance(node, ast.Expression):
+            return build(node.body)
+        if isinstance(node, ast.BoolOp):
+            parts = [build(v) for v in node.values]
+            if isinstance(node.op, ast.And):
+                return lambda ns: all(p(ns) for p in parts)
+            return lambda ns: any(p(ns) for p in parts)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            inner = build(node.operand)
+            return lambda ns: not inner(ns)
+        if isinstance(node, ast.Compare):
+            left = build(node.left)
+            pairs = [(_CMP_OPS[type(op)], build(cmp)) for op, cmp in zip(node.ops, node.comparators)]
+
+            def chain(ns: Dict[str, Any], left=left, pairs=pairs) -> bool:
+                a = left(ns)
+                for op, rhs in pairs:
+                    b = rhs(ns)
+                    if not op(a, b):
+                        return False
+                    a = b
+                return True
+
+            return chain
+        if isinstance(node, ast.Name):
+            name = node.id
+            return lambda ns: ns[name]
+        if isinstance(node, ast.Constant):
+            value = node.value
+            return lambda ns: value
+        raise ValueError(f"unsupported expression node: {type(node).__name__}")
+
+    return build(tree)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_policy_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse the policy YAML once per (path, mtime); repeat engine
+    construction against an unchanged file is then a dict lookup."""
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
+
+
+# Safe defaults if no policy file is present — built once at import instead of
+# per constructor call.
+_DEFAULT_POLICY: Dict[str, Any] = {
+    "bands": {
+        "s1": {
+            "pressure_thresholds": {
+                "low": 0.20,
+                "medium": 0.35,
+                "high": 0.65,
+                "critical": 0.90,
+            }
+        }
+    },
+    "routing": {
+        "rules": [
+            {
+                "name": "Critical risk blocking",
+                "condition": "s1.pressure >= bands.s1.pressure_thresholds.critical",
+                "action": "block",
+                "reason": "Critical security risk detected",
+            },
+            {
+                "name": "High risk blocking",
+                "condition": "s1.pressure >= bands.s1.pressure_thresholds.high",
+                "action": "block",
+                "reason": "High security risk detected",
+            },
+            {
+                "name": "Budget exhaustion",
+                "condition": "budget.remaining_epsilon < 0.01",
+                "action": "block",
+                "reason": "Privacy budget exhausted",
+            },
+            {
+                "name": "Rate limiting",
+                "condition": "rate_limit.queries_per_minute_exceeded == True",
+                "action": "block",
+                "reason": "Rate limit exceeded",
+                "retry_after": 60,
+            },
+            {
+                "name": "Scope authorization",
+                "condition": "query.required_scope != user.scope",
+                "action": "block",
+                "reason": "Insufficient authorization scope",
+            },
+            {
+                "name": "Medium risk template enforcement",
+                "condition": "s1.pressure >= bands.s1.pressure_thresholds.medium",
+                "action": "template",
+                "reason": "Medium risk - restricted to template responses",
+                "template_set": ["general_info"],  # maps to your S2 set
+            },
+            {
+                "name": "Low risk template enforcement",
+                "condition": "s1.pressure >= bands.s1.pressure_thresholds.low",
+                "action": "template",
+                "reason": "Low risk - public information only",
+                "template_set": ["general_info"],
+            },
+            {
+                "name": "Default allow",
+                "condition": "default",
+                "action": "allow",
+                "reason": "Low risk",
+            },
+        ]
+    },
+}
+
 
 @dataclass
 class PolicyDecision:
@@ -27,7 +190,16 @@ class PolicyEngine:
 
         # Cached views for convenience
         self._thr = self._policy["bands"]["s1"]["pressure_thresholds"]
-        self._rules = self._policy["routing"]["rules"]
+
+        # Rules are fixed once loaded: compile each condition to a code object
+        # so routing never redoes string expansion or expression parsing.
+        # Per-engine shallow copies: the loaded rules may come straight from
+        # the lru-cached policy or the shared module default, and stamping
+        # compiled code into those dicts would mutate data every other engine
+        # (and future cache hits) sees.
+        self._rules = [dict(rule) for rule in self._policy["routing"]["rules"]]
+        for rule in self._rules:
+            rule["_code"] = self._compile(rule.get("condition", "default"))
 
     # ---------- Public API ----------
     def route(
@@ -46,22 +218,22 @@ class PolicyEngine:
             - required_scope: str
         """
         hints = hints or {}
-        ctx = {
-            "s1.pressure": float(s1.get("pressure", 0.0)),
-            "s1.risk_level": str(s1.get("risk_level", "low")),
-            "user.scope": user_scope,
-            "budget.remaining_epsilon": float(
+        ns = {
+            "s1_pressure": float(s1.get("pressure", 0.0)),
+            "s1_risk_level": str(s1.get("risk_level", "low")),
+            "user_scope": user_scope,
+            "budget_remaining_epsilon": float(
                 (hints.get("budget") or {}).get("remaining_epsilon", 99.0)
             ),
-            "rate_limit.queries_per_minute_exceeded": bool(
+            "rate_limit_queries_per_minute_exceeded": bool(
                 (hints.get("rate_limit") or {}).get("qpm_exceeded", False)
             ),
-            "query.required_scope": (hints.get("required_scope") or user_scope),
+            "query_required_scope": (hints.get("required_scope") or user_scope),
         }
 
         # Evaluate rules top-to-bottom, first match wins
         for rule in self._rules:
-            if self._eval(rule["condition"], ctx):
+            if self._matches(rule["_code"], ns):
                 return PolicyDecision(
                     action=rule["action"],
                     reason=rule.get("reason", rule["name"]),
@@ -80,118 +252,47 @@ class PolicyEngine:
     # ---------- Internals ----------
     def _load_policy(self, path: Optional[str]) -> Dict[str, Any]:
         if path and os.path.exists(path):
-            with open(path, "r") as f:
-                return yaml.safe_load(f)
-
-        # Safe defaults if no file present
-        return {
-            "bands": {
-                "s1": {
-                    "pressure_thresholds": {
-                        "low": 0.20,
-                        "medium": 0.35,
-                        "high": 0.65,
-                        "critical": 0.90,
-                    }
-                }
-            },
-            "routing": {
-                "rules": [
-                    {
-                        "name": "Critical risk blocking",
-                        "condition": "s1.pressure >= bands.s1.pressure_thresholds.critical",
-                        "action": "block",
-                        "reason": "Critical security risk detected",
-                    },
-                    {
-                        "name": "High risk blocking",
-                        "condition": "s1.pressure >= bands.s1.pressure_thresholds.high",
-                        "action": "block",
-                        "reason": "High security risk detected",
-                    },
-                    {
-                        "name": "Budget exhaustion",
-                        "condition": "budget.remaining_epsilon < 0.01",
-                        "action": "block",
-                        "reason": "Privacy budget exhausted",
-                    },
-                    {
-                        "name": "Rate limiting",
-                        "condition": "rate_limit.queries_per_minute_exceeded == True",
-                        "action": "block",
-                        "reason": "Rate limit exceeded",
-                        "retry_after": 60,
-                    },
-                    {
-                        "name": "Scope authorization",
-                        "condition": "query.required_scope != user.scope",
-                        "action": "block",
-                        "reason": "Insufficient authorization scope",
-                    },
-                    {
-                        "name": "Medium risk template enforcement",
-                        "condition": "s1.pressure >= bands.s1.pressure_thresholds.medium",
-                        "action": "template",
-                        "reason": "Medium risk - restricted to template responses",
-                        "template_set": ["general_info"],  # maps to your S2 set
-                    },
-                    {
-                        "name": "Low risk template enforcement",
-                        "condition": "s1.pressure >= bands.s1.pressure_thresholds.low",
-                        "action": "template",
-                        "reason": "Low risk - public information only",
-                        "template_set": ["general_info"],
-                    },
-                    {
-                        "name": "Default allow",
-                        "condition": "default",
-                        "action": "allow",
-                        "reason": "Low risk",
-                    },
-                ]
-            },
-        }
+            # Keyed by mtime so an edited file reloads while warm restarts of
+            # the same policy skip the YAML parse entirely.
+            return _load_policy_cached(path, os.stat(path).st_mtime_ns)
+        return _DEFAULT_POLICY
 
-    def _eval(self, condition: str, ctx: Dict[str, Any]) -> bool:
+    def _compile(self, condition: str) -> Any:
+        """Compile one rule condition once at load time.
+
+        Returns None for the always-true "default" rule, False for a rule that
+        can never match (bad threshold reference / syntax — the old behavior
+        was to silently evaluate to False), else a predicate closure over the
+        underscored ctx names prepared in route().
+        """
         if condition == "default":
-            return True
+            return None
 
-        # make a tiny expression language: we support comparisons & equality
-        # replace known tokens with their literal values
-        # Example in YAML: "s1.pressure >= bands.s1.pressure_thresholds.medium"
-        # We expand "bands.s1.pressure_thresholds.medium" from the loaded policy.
-        expanded = condition
-
-        # Expand policy constants (bands.*)
-        def dig(root: Dict[str, Any], dotted: str) -> Any:
-            node: Any = root
-            for p in dotted.split("."):
-                node = node[p]
-            return node
-
-        # First, expand any 'bands.' references
-        while "bands." in expanded:
-            start = expanded.index("bands.")
-            end = self._find_token_end(expanded, start)
-            token = expanded[start:end]
-            value = dig(self._policy, token)
-            expanded = expanded.replace(token, repr(value))
-
-        # Now expand ctx variables
-        for k, v in ctx.items():
-            expanded = expanded.replace(k, repr(v))
-
-        # only allow a safe subset of Python expressions
-        allowed_names = {"True": True, "False": False}
+        # Expand policy constants (bands.*) to literals — they are fixed for
+        # the lifetime of the engine.
         try:
-            return bool(eval(expanded, {"__builtins__": {}}, allowed_names))
+            expanded = _BANDS_RE.sub(
+                lambda m: repr(_dig(self._policy, m.group(0))), condition
+            )
         except Exception:
             return False
 
+        # Rewrite dotted ctx tokens into valid identifiers (s1.pressure ->
+        # s1_pressure) in a single alternation pass.
+        expanded = _CTX_RE.sub(lambda m: m.group(0).replace(".", "_"), expanded)
+
+        try:
+            return _compile_predicate(expanded)
+        except (SyntaxError, ValueError, KeyError):
+            return False
+
     @staticmethod
-    def _find_token_end(s: str, start: int) -> int:
-        # token ends on whitespace or comparator characters
-        i = start
-        while i < len(s) and s[i] not in " <>!=()&|+-*/,\n\t":
-            i += 1
-        return i
\ No newline at end of file
+    def _matches(predicate: Any, ns: Dict[str, Any]) -> bool:
+        if predicate is None:
+            return True
+        if predicate is False:
+            return False
+        try:
+            return bool(predicate(ns))
+        except Exception:
+            return False
\ No newline at end of file
@@ -13,6 +13,8 @@ Features
 
 Output schema
 -------------
+classify() returns a Classification record (dict-compatible via []/.get/in;
+to_dict() for JSON) shaped as:
 {
   "risk_level": "low|medium|high|critical",
   "pressure": float,            # 0.0–1.0
@@ -30,6 +32,7 @@ Output schema
             "engine": "regex|ac"
           }, ...
       ],
+      "category_counts": {"instruction_injection": 1, ...},
       "semantic_intents": ["attack_attempt", ...],
       "context_flags": ["multi_turn_setup", ...]
   }
@@ -38,36 +41,131 @@ Output schema
 
 from __future__ import annotations
 
+import bisect
+import hashlib
+import math
 import os
+import pickle
 import re
 import json
-import math
 import argparse
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 try:
     import yaml  # optional
 except Exception:
     yaml = None
 
+try:
+    import ahocorasick  # optional C automaton (pyahocorasick); ~100x the pure-Python walk
+except Exception:
+    ahocorasick = None
+
+try:
+    import re2  # optional linear-time engine (google-re2); immune to backtracking blowups
+except Exception:
+    re2 = None
+
+try:
+    from re import _constants as _sre_c, _parser as _sre_p  # seed extraction
+except ImportError:
+    _sre_c = _sre_p = None
+
+
+def _required_literal(regex: Any, min_len: int = 4) -> Optional[str]:
+    """Extract a literal substring that every match of `regex` must contain.
+
+    Walks the sre parse tree accumulating runs of LITERAL nodes, recursing
+    only into positions that are provably required (plain groups, repeats
+    with min >= 1) — branches and optional parts are skipped, so the result
+    is conservative: it may miss a seed, never invent one. Returns the
+    longest such run (lowercased, for matching against text_lc) or None.
+    """
+    if _sre_p is None:
+        return None
+    src = getattr(regex, "pattern", None)
+    if not isinstance(src, str):
+        return None
+    try:
+        parsed = _sre_p.parse(src)
+    except Exception:
+        return None
+
+    best = ""
+
+    def walk(seq: Any) -> None:
+        nonlocal best
+        run: List[str] = []
+
+        def flush() -> None:
+            nonlocal best
+            if len(run) > len(best):
+                best = "".join(run)
+            run.clear()
+
+        for op, arg in seq:
+            if op is _sre_c.LITERAL and arg <= 255:
+                run.append(chr(arg).lower())
+            elif op is _sre_c.SUBPATTERN:
+                flush()
+                walk(arg[-1])
+            elif op in (_sre_c.MAX_REPEAT, _sre_c.MIN_REPEAT):
+                flush()
+                if arg[0] >= 1:
+                    walk(arg[2])
+            else:
+                flush()
+        flush()
+
+    walk(parsed)
+    return best if len(best) >= min_len else None
+
+
+def _compile_pattern(pat: str, flags: int = re.IGNORECASE | re.DOTALL):
+    """Compile with RE2 when installed, stdlib re otherwise.
+
+    Falls back per pattern: RE2 rejects some constructs (backreferences,
+    lookarounds) that stdlib accepts."""
+    if re2 is not None:
+        try:
+            return re2.compile(pat, flags)
+        except Exception:
+            pass
+    return re.compile(pat, flags)
+
 # ---------------- Aho-Corasick (minimal local) ------------------------------
 
 class _ACNode:
     __slots__ = ("next", "fail", "out")
     def __init__(self):
-        self.next: Dict[str, _ACNode] = {}
+        self.next: Dict[int, _ACNode] = {}  # keyed by byte value
         self.fail: Optional[_ACNode] = None
         self.out: List[Tuple[str, str]] = []  # [(category, pattern_id)]
 
 class _AhoCorasick:
     def __init__(self):
         self.root = _ACNode()
+        # Flat DFA (built by _compile_dfa): transition array indexed by
+        # state*num_classes + byte_class, 256-entry byte→class table, and
+        # per-state output lists. None until build() succeeds in compiling.
+        self._trans: Optional[array] = None
+        self._cls: Optional[bytes] = None
+        self._nclasses: int = 0
+        # CSR-style outputs: state s emits _out_data[_out_offsets[s]:_out_offsets[s+1]].
+        self._out_offsets: Optional[array] = None
+        self._out_data: List[Tuple[str, str]] = []
 
     def add(self, pat: str, tag: Tuple[str, str]) -> None:
+        # Trie over byte values: int keys hash cheaper than 1-char strings and
+        # let the scan iterate a bytes buffer without boxing characters.
+        # Raises UnicodeEncodeError for non-latin-1 patterns; callers skip
+        # those (the regex pass still covers them).
         node = self.root
-        for ch in pat:
-            node = node.next.setdefault(ch, _ACNode())
+        for b in pat.encode("latin-1"):
+            node = node.next.setdefault(b, _ACNode())
         node.out.append(tag)
 
     def build(self) -> None:
@@ -78,28 +176,184 @@ class _AhoCorasick:
             q.append(node)
         while q:
             r = q.popleft()
-            for ch, nxt in r.next.items():
+            for b, nxt in r.next.items():
                 q.append(nxt)
                 f = r.fail
-                while f and ch not in f.next:
+                while f and b not in f.next:
                     f = f.fail
-                nxt.fail = f.next[ch] if f and ch in f.next else self.root
+                nxt.fail = f.next[b] if f and b in f.next else self.root
                 nxt.out += nxt.fail.out if nxt.fail else []
+        self._compile_dfa()
+
+    def _compile_dfa(self) -> None:
+        """Flatten the trie + failure links into a dense DFA over byte classes.
+
+        Each scan step becomes one integer index into a contiguous array
+        instead of dict lookups chained through failure hops. Bytes with
+        identical transition behaviour share an equivalence class, which
+        collapses the alphabet to a handful of columns for ASCII pattern sets.
+        """
+        from collections import deque
+        states: List[_ACNode] = [self.root]
+        ids: Dict[int, int] = {id(self.root): 0}
+        q = deque([self.root])
+        while q:
+            node = q.popleft()
+            for nxt in node.next.values():
+                if id(nxt) not in ids:
+                    ids[id(nxt)] = len(states)
+                    states.append(nxt)
+                    q.append(nxt)
+
+        def step(node: _ACNode, b: int) -> _ACNode:
+            while node is not None and b not in node.next:
+                node = node.fail
+            return node.next[b] if node is not None else self.root
+
+        n = len(states)
+        # Dense per-byte columns, then group identical columns into classes.
+        columns: List[Tuple[int, ...]] = []
+        for b in range(256):
+            columns.append(tuple(ids[id(step(s, b))] for s in states))
+        class_of: Dict[Tuple[int, ...], int] = {}
+        cls = bytearray(256)
+        for b, col in enumerate(columns):
+            cls[b] = class_of.setdefault(col, len(class_of))
+        c = len(class_of)
+
+        trans = array("i", [0] * (n * c))
+        for col, k in class_of.items():
+            for s, nxt in enumerate(col):
+                trans[s * c + k] = nxt
+
+        # Flatten outputs to offsets+data (SoA): the scan loop tests a pair of
+        # ints per step instead of touching a list-of-lists.
+        offsets = array("i", [0] * (n + 1))
+        data: List[Tuple[str, str]] = []
+        for s, node in enumerate(states):
+            data.extend(node.out)
+            offsets[s + 1] = len(data)
+
+        self._trans = trans
+        self._cls = bytes(cls)
+        self._nclasses = c
+        self._out_offsets = offsets
+        self._out_data = data
 
     def finditer(self, text: str):
+        # encode() with "replace" keeps a 1:1 char->byte index mapping;
+        # replacement bytes ("?") can never false-match because literal
+        # patterns exclude regex metacharacters.
+        buf = text.encode("latin-1", "replace")
+        trans = self._trans
+        if trans is not None:
+            cls = self._cls
+            c = self._nclasses
+            offs = self._out_offsets
+            data = self._out_data
+            state = 0
+            for i, b in enumerate(buf):
+                state = trans[state * c + cls[b]]
+                o0 = offs[state]
+                o1 = offs[state + 1]
+                if o1 != o0:
+                    for (category, pattern_id) in data[o0:o1]:
+                        yield (i, category, pattern_id)
+            return
         node = self.root
-        for i, ch in enumerate(text):
-            while node and ch not in node.next:
+        for i, b in enumerate(buf):
+            while node and b not in node.next:
                 node = node.fail
             if not node:
                 node = self.root
                 continue
-            node = node.next[ch]
+            node = node.next[b]
             for (category, pattern_id) in node.out:
                 yield (i, category, pattern_id)
 
 # ---------------- Data structures ------------------------------------------
 
+class _Match(NamedTuple):
+    """Internal match record: a flat tuple instead of a 7-key dict per hit.
+
+    Snippets are sliced lazily in classify() for the deduped survivors only;
+    being immutable, these are also safe to share out of the match cache.
+    """
+    category: str
+    pattern_id: str
+    severity: str
+    start: int
+    end: int
+    weight: float
+    engine: str
+
+
+@dataclass(slots=True, frozen=True)
+class Classification:
+    """Slotted classify() result.
+
+    Hot-path consumers read attributes directly; dict-style consumers keep
+    working through the same ``[]``/``.get``/``in`` shim SRAResponse uses,
+    and ``to_dict()`` materializes for JSON boundaries. The record is
+    frozen and shared through caches, so ``to_dict()`` copies.
+    """
+
+    risk_level: str
+    pressure: float
+    reasons: List[str]
+    features: Dict[str, Any]
+
+    _KEYS = ("risk_level", "pressure", "confidence", "reasons", "features")
+
+    @property
+    def confidence(self) -> float:
+        return self.pressure  # alias, monotone with pressure
+
+    # --- dict-compat shim ---
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._KEYS:
+            return getattr(self, key)
+        return default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._KEYS
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._KEYS
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(k, getattr(self, k)) for k in self._KEYS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Fresh nested containers per call: classifications are shared by
+        # reference through the result caches, and callers are free to
+        # mutate the dicts they receive — a memoized/shared dict here let
+        # one caller's edits leak into every later response for the same
+        # input.
+        f = self.features
+        return {
+            "risk_level": self.risk_level,
+            "pressure": self.pressure,
+            "confidence": self.pressure,
+            "reasons": list(self.reasons),
+            "features": {
+                "pattern_matches": [dict(m) for m in f.get("pattern_matches", ())],
+                "category_counts": dict(f.get("category_counts") or {}),
+                "semantic_intents": list(f.get("semantic_intents", ())),
+                "context_flags": list(f.get("context_flags", ())),
+            },
+        }
+
+
 @dataclass
 class Pattern:
     regex: Optional[re.Pattern]
@@ -120,6 +374,12 @@ class S1Config:
 
 _DEFAULT_THRESHOLDS = {"low": 0.20, "medium": 0.40, "high": 0.70, "critical": 0.90}
 
+# Match-result LRU: retried prompts and re-retrieved RAG chunks skip the
+# AC + regex pass entirely. Texts below the floor are cheaper to rescan
+# than to hash.
+_MATCH_CACHE_MAX = 4096
+_MATCH_CACHE_MIN_LEN = 32
+
 _BUILTIN_PATTERNS: List[Tuple[str, str, str, float]] = [
     ("instruction_injection", r"ignore\s+(all\s+)?(previous|prior|earlier)\s+(instructions?|prompts?|commands?)", "high", 0.95),
     ("credential_extraction", r"(reveal|show|display|tell)\s+.{0,20}(secret|password|key|token|credential)s?", "high", 0.90),
@@ -141,7 +401,34 @@ def _safe_yaml_load(path: str) -> Optional[Dict[str, Any]]:
         return {}
     return y
 
+def _config_cache_path(path: str) -> Optional[str]:
+    """Sidecar pickle for a compiled config, keyed by content hash.
+
+    Only active when SRA_CACHE_DIR is set; a content-hash key means an edited
+    YAML simply misses and recompiles, no mtime bookkeeping needed.
+    """
+    cache_dir = os.environ.get("SRA_CACHE_DIR")
+    if not cache_dir:
+        return None
+    try:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+    return os.path.join(cache_dir, f"s1_{digest[:32]}.pkl")
+
+
 def _load_yaml_patterns(path: str) -> Optional[S1Config]:
+    cache_path = _config_cache_path(path) if os.path.exists(path) else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if isinstance(cached, S1Config):
+                return cached
+        except Exception:
+            pass  # stale/corrupt sidecar: fall through and recompile
+
     y = _safe_yaml_load(path)
     if y is None:
         return None
@@ -191,7 +478,7 @@ def _load_yaml_patterns(path: str) -> Optional[S1Config]:
         regex = None
         looks_literal = not re.search(r"[.^$*+?{}\[\]|()\\]", pat)
         try:
-            regex = re.compile(pat, re.IGNORECASE | re.DOTALL)
+            regex = _compile_pattern(pat)
         except re.error:
             looks_literal = True
             regex = None
@@ -200,13 +487,21 @@ def _load_yaml_patterns(path: str) -> Optional[S1Config]:
         compiled.append(Pattern(regex=regex, literal=literal, category=cat,
                                 pattern_id=pid, severity=severity, weight=float(weight)))
 
-    return S1Config(thresholds=thresholds, patterns=compiled, use_ac=True)
+    cfg = S1Config(thresholds=thresholds, patterns=compiled, use_ac=True)
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, "wb") as f:
+                pickle.dump(cfg, f)  # re.Pattern pickles natively (3.7+)
+        except Exception:
+            pass  # caching is best-effort
+    return cfg
 
 def _builtin_config() -> S1Config:
     compiled: List[Pattern] = []
     for idx, (cat, pat, sev, wt) in enumerate(_BUILTIN_PATTERNS):
         compiled.append(Pattern(
-            regex=re.compile(pat, re.IGNORECASE | re.DOTALL),
+            regex=_compile_pattern(pat),
             literal=None,
             category=cat,
             pattern_id=f"{cat}__{idx}",
@@ -217,35 +512,52 @@ def _builtin_config() -> S1Config:
 
 # ---------------- Semantic intent shim -------------------------------------
 
-def _semantic_intents(text: str) -> List[str]:
-    intents = []
-    t = text.lower()
-    if any(k in t for k in [
+# Keyword → intent, folded into one alternation with a named group per intent
+# so detection is a single scan instead of one substring search per keyword.
+_INTENT_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "attack_attempt": (
         "ignore previous", "ignore instructions", "jailbreak",
-        "bypass security", "bypass guard"
-    ]):
-        intents.append("attack_attempt")
-    if any(k in t for k in [
+        "bypass security", "bypass guard",
+    ),
+    "system_probe": (
         "how were you trained", "show your training",
-        "system prompt", "reveal system prompt", "reveal the system prompt"
-    ]):
-        intents.append("system_probe")
-    return intents
+        "system prompt", "reveal system prompt", "reveal the system prompt",
+    ),
+}
+
+_INTENT_RX = re.compile(
+    "|".join(
+        f"(?P<{intent}>{'|'.join(re.escape(k) for k in kws)})"
+        for intent, kws in _INTENT_KEYWORDS.items()
+    )
+)
+
+
+def _semantic_intents(text_lc: str) -> List[str]:
+    """Expects pre-lowercased text; classify() lowers once and threads the
+    same copy through every pass rather than re-lowering per helper."""
+    hits = {m.lastgroup for m in _INTENT_RX.finditer(text_lc)}
+    return [intent for intent in _INTENT_KEYWORDS if intent in hits]
 
 # ---------------- Context heuristics ---------------------------------------
 
+# All three heuristics folded into one alternation (compiled at import, same
+# shape as _INTENT_RX): a single finditer pass over the recent history instead
+# of three separate searches through re's compile cache.
+_CTX_FLAG_ORDER = ("multi_turn_setup", "latent_trigger_setup", "context_reset_probe")
+_CTX_FLAGS_RX = re.compile(
+    r"(?P<multi_turn_setup>\bremember\b.{0,20}\b(?:for later|next time)\b)"
+    r"|(?P<latent_trigger_setup>\b(?:code\s*word|trigger|signal|phrase)\b)"
+    r"|(?P<context_reset_probe>\bstart over\b|\breset\b)"
+)
+
+
 def _context_flags(history: Optional[List[str]]) -> List[str]:
-    flags: List[str] = []
     if not history:
-        return flags
+        return []
     last = " ".join(history[-5:]).lower()
-    if re.search(r"\bremember\b.{0,20}\b(for later|next time)\b", last):
-        flags.append("multi_turn_setup")
-    if re.search(r"\b(code\s*word|trigger|signal|phrase)\b", last):
-        flags.append("latent_trigger_setup")
-    if re.search(r"\bstart over\b|\breset\b", last):
-        flags.append("context_reset_probe")
-    return flags
+    hits = {m.lastgroup for m in _CTX_FLAGS_RX.finditer(last)}
+    return [flag for flag in _CTX_FLAG_ORDER if flag in hits]
 
 # ---------------- S1 Detector ----------------------------------------------
 
@@ -255,10 +567,16 @@ class S1Detector:
     Returns structured dict with risk level, pressure (confidence), reasons, and features.
 
     Pressure aggregation:
-        base = 1 - exp(-k * sum(weights(matches)))      [logistic squash; k≈0.9]
+        per family f: s += max_weight(f) * min(1.5, 1.0 + 0.25*(n_f - 1))
+        base = 1 - exp(-0.9 * s)
         + 0.20 if suspicious semantic intents present
         + 0.10 if context flags indicate multi-turn setup / latent triggers
+        + size nudges for oversized inputs / very long lines
         Clamp to [0.0, 1.0], then map to categorical via thresholds.
+
+    The per-family damping saturates repeated hits within one category, so a
+    dozen near-duplicate low-grade matches cannot drown out a single
+    high-severity hit from another family.
     """
 
     def __init__(self, config_path: Optional[str] = None):
@@ -277,122 +595,225 @@ class S1Detector:
 
         self.cfg = cfg
 
-        # Build AC over literal-ish patterns
+        # Build AC over literal-ish patterns, plus one required-literal seed
+        # per regex pattern where one can be soundly extracted. The seeds turn
+        # the AC pass into a prefilter: a regex only runs when its seed (or
+        # its own literal) appeared, so benign traffic skips most of the
+        # regex pass outright. Prefer the pyahocorasick C extension when
+        # installed; fall back to the local pure-Python automaton otherwise.
         self.ac = None
+        self._ac_native = None
+        self._seeded: frozenset = frozenset()
         if self.cfg.use_ac:
-            ac = _AhoCorasick()
-            lit_count = 0
+            words: Dict[str, List[Tuple[str, str]]] = {}
+            seeded = set()
             for p in self.cfg.patterns:
                 if p.literal and len(p.literal) >= self.cfg.ac_min_len:
-                    ac.add(p.literal.lower(), (p.category, p.pattern_id))
-                    lit_count += 1
-            if lit_count:
+                    w = p.literal.lower()
+                    try:
+                        w.encode("latin-1")
+                    except UnicodeEncodeError:
+                        continue  # non-latin-1 literal: regex pass covers it
+                    words.setdefault(w, []).append((p.category, p.pattern_id))
+                    seeded.add(p.pattern_id)
+            for p in self.cfg.patterns:
+                if p.regex is None or p.pattern_id in seeded:
+                    continue
+                seed = _required_literal(p.regex, self.cfg.ac_min_len)
+                if not seed:
+                    continue
+                try:
+                    seed.encode("latin-1")
+                except UnicodeEncodeError:
+                    continue
+                words.setdefault(seed, []).append(("__seed__", p.pattern_id))
+                seeded.add(p.pattern_id)
+
+            if words and ahocorasick is not None:
+                native = ahocorasick.Automaton()
+                for w, tags in words.items():
+                    native.add_word(w, [(cat, pid, len(w)) for cat, pid in tags])
+                native.make_automaton()
+                self._ac_native = native
+                self._seeded = frozenset(seeded)
+            elif words:
+                ac = _AhoCorasick()
+                for w, tags in words.items():
+                    for tag in tags:
+                        ac.add(w, tag)
                 ac.build()
                 self.ac = ac
+                self._seeded = frozenset(seeded)
+
+        # Bucketing thresholds as a sorted tuple so _to_level is one C-level
+        # binary search instead of a chain of Python comparisons.
+        th = self.cfg.thresholds
+        self._level_bounds = (
+            th.get("medium", 0.40),
+            th.get("high", 0.70),
+            th.get("critical", 0.90),
+        )
+        self._level_labels = ("low", "medium", "high", "critical")
 
         self._by_id = {p.pattern_id: p for p in self.cfg.patterns}
+        self._match_cache: "OrderedDict[bytes, List[_Match]]" = OrderedDict()
 
     # ---- Public API --------------------------------------------------------
 
-    def classify(self, text: str, context_history: Optional[List[str]] = None) -> Dict[str, Any]:
+    def classify(self, text: str, context_history: Optional[List[str]] = None) -> Classification:
         text_lc = text.lower()
 
         # 1) Pattern matches
         matches = self._find_matches(text, text_lc)
 
-        # 2) Semantic intents
-        intents = _semantic_intents(text)
+        # 2) Semantic intents (reuses the lowered copy from step 1)
+        intents = _semantic_intents(text_lc)
 
         # 3) Context analysis
         flags = _context_flags(context_history)
 
         # 4) Pressure aggregation
-        pressure, reasons = self._aggregate_pressure(matches, intents, flags)
+        pressure, reasons = self._aggregate_pressure(matches, intents, flags, text)
 
         # 5) Risk bucket
         level = self._to_level(pressure)
 
-        return {
-            "risk_level": level,
-            "pressure": pressure,
-            "confidence": pressure,
-            "reasons": reasons,
-            "features": {
-                "pattern_matches": matches,
+        # Per-category tallies so routers can check e.g. pii_leak in O(1)
+        # instead of re-walking pattern_matches (categories are already
+        # normalized lowercase in the pattern DB).
+        category_counts: Dict[str, int] = {}
+        for m in matches:
+            category_counts[m.category] = category_counts.get(m.category, 0) + 1
+
+        # Dict records (with snippets sliced) are built only here, at the
+        # output boundary, and only for deduped survivors — the scan, dedup
+        # and match cache all work on flat _Match tuples.
+        n = len(text)
+        pattern_matches = [
+            {
+                "category": m.category,
+                "pattern_id": m.pattern_id,
+                "severity": m.severity,
+                "span": (m.start, m.end),
+                "snippet": text[max(0, m.start):min(n, m.end)],
+                "weight": m.weight,
+                "engine": m.engine,
+            }
+            for m in matches
+        ]
+
+        return Classification(
+            risk_level=level,
+            pressure=pressure,
+            reasons=reasons,
+            features={
+                "pattern_matches": pattern_matches,
+                "category_counts": category_counts,
                 "semantic_intents": intents,
                 "context_flags": flags,
             },
-        }
+        )
 
     # ---- Internals ---------------------------------------------------------
 
-    def _find_matches(self, text: str, text_lc: str) -> List[Dict[str, Any]]:
-        out: List[Dict[str, Any]] = []
-
-        # AC pass (fast substrings)
-        if self.ac:
+    def _find_matches(self, text: str, text_lc: str) -> List[_Match]:
+        if len(text) < _MATCH_CACHE_MIN_LEN:
+            return self._scan(text, text_lc)
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        cached = self._match_cache.get(key)
+        if cached is not None:
+            self._match_cache.move_to_end(key)
+            return cached
+        matches = self._scan(text, text_lc)
+        self._match_cache[key] = matches
+        if len(self._match_cache) > _MATCH_CACHE_MAX:
+            self._match_cache.popitem(last=False)
+        return matches
+
+    def _scan(self, text: str, text_lc: str) -> List[_Match]:
+        out: List[_Match] = []
+        seen_ids = set()
+
+        # AC pass (fast substrings + prefilter seeds)
+        if self._ac_native is not None:
+            for i, tags in self._ac_native.iter(text_lc):
+                for (cat, pid, L) in tags:
+                    seen_ids.add(pid)
+                    if cat == "__seed__":
+                        continue
+                    p = self._by_id.get(pid)
+                    if not p:
+                        continue
+                    out.append(_Match(cat, pid, p.severity, max(0, i - L + 1), i + 1,
+                                      p.weight, "ac"))
+        elif self.ac:
             for i, cat, pid in self.ac.finditer(text_lc):
+                seen_ids.add(pid)
+                if cat == "__seed__":
+                    continue
                 p = self._by_id.get(pid)
                 if not p:
                     continue
                 L = len(p.literal or "")
-                start = max(0, i - L + 1)
-                end = i + 1
-                out.append({
-                    "category": cat,
-                    "pattern_id": pid,
-                    "severity": p.severity,
-                    "span": [start, end],
-                    "snippet": text[max(0, start):min(len(text), end)],
-                    "weight": p.weight,
-                    "engine": "ac",
-                })
-
-        # Regex pass (precise)
+                out.append(_Match(cat, pid, p.severity, max(0, i - L + 1), i + 1,
+                                  p.weight, "ac"))
+
+        # Regex pass (precise), gated by the prefilter: a seeded pattern whose
+        # required literal never appeared cannot match, so skip its finditer.
+        seeded = self._seeded
         for p in self.cfg.patterns:
             if not p.regex:
                 continue
+            if p.pattern_id in seeded and p.pattern_id not in seen_ids:
+                continue
             for m in p.regex.finditer(text):
                 start, end = m.span()
-                snippet = text[max(0, start):min(len(text), end)]
-                out.append({
-                    "category": p.category,
-                    "pattern_id": p.pattern_id,
-                    "severity": p.severity,
-                    "span": [start, end],
-                    "snippet": snippet,
-                    "weight": p.weight,
-                    "engine": "regex",
-                })
-
-        # Deduplicate (prefer regex over AC)
-        seen = set()
-        deduped: List[Dict[str, Any]] = []
-        for rec in sorted(out, key=lambda r: (r["engine"] != "regex", -r["weight"])):
-            key = (rec["pattern_id"], tuple(rec["span"]))
-            if key in seen:
-                continue
-            seen.add(key)
-            deduped.append(rec)
-        return deduped
+                out.append(_Match(p.category, p.pattern_id, p.severity, start, end,
+                                  p.weight, "regex"))
+
+        # Deduplicate (prefer regex over AC): one dict pass keyed on
+        # (pattern_id, span) keeping the best-priority record — O(N) with no
+        # Python-level comparator.
+        best: Dict[Tuple[str, int, int], Tuple[Tuple[int, float], _Match]] = {}
+        for rec in out:
+            key = (rec.pattern_id, rec.start, rec.end)
+            pri = (0 if rec.engine == "regex" else 1, -rec.weight)
+            cur = best.get(key)
+            if cur is None or pri < cur[0]:
+                best[key] = (pri, rec)
+        return [v[1] for v in best.values()]
 
     def _aggregate_pressure(
         self,
-        matches: List[Dict[str, Any]],
+        matches: List[_Match],
         intents: List[str],
         flags: List[str],
+        text: str,
     ) -> Tuple[float, List[str]]:
-        s = 0.0
         reasons: List[str] = []
+
+        # Per-family saturating damping: repeated hits within one category
+        # grow sub-linearly (capped at 1.5x the family's strongest weight),
+        # so pattern spam in one family cannot drown out a distinct hit
+        # elsewhere.
+        fam_max: Dict[str, float] = {}
+        fam_n: Dict[str, int] = {}
         for m in matches:
-            s += float(m.get("weight", 0.0))
+            cat = m.category
+            fam_n[cat] = fam_n.get(cat, 0) + 1
+            if m.weight > fam_max.get(cat, 0.0):
+                fam_max[cat] = m.weight
+
+        s = 0.0
+        for cat, w in fam_max.items():
+            s += w * min(1.5, 1.0 + 0.25 * (fam_n[cat] - 1))
         if s > 0:
             reasons.append(f"{len(matches)} pattern match(es) detected")
 
-        # Logistic squash to [0,1]; prevents weight explosions
-        k = 0.9
-        base = 1.0 - math.exp(-k * s)
-        pressure = base
+        # Exponential squash to [0,1): same curve the thresholds were tuned
+        # against, applied to the damped sum. (A cheaper rational squash
+        # lowered canonical single-hit attacks below the high/block band.)
+        pressure = 1.0 - math.exp(-0.9 * s)
 
         if any(t in intents for t in ("attack_attempt", "system_probe")):
             pressure += 0.20
@@ -402,18 +823,20 @@ class S1Detector:
             pressure += 0.10
             reasons.append("context anomaly")
 
+        # Size heuristics: oversized payloads and extreme single lines are
+        # classic smuggling shapes regardless of pattern content.
+        if len(text) > 100_000:
+            pressure += 0.15
+            reasons.append("oversized input")
+        if len(text) > 2000 and any(len(line) > 2000 for line in text.splitlines()):
+            pressure += 0.20
+            reasons.append("very long line")
+
         pressure = max(0.0, min(1.0, pressure))
         return pressure, (reasons or ["no risky pattern matched"])
 
     def _to_level(self, pressure: float) -> str:
-        th = self.cfg.thresholds
-        if pressure >= th.get("critical", 0.90):
-            return "critical"
-        if pressure >= th.get("high", 0.70):
-            return "high"
-        if pressure >= th.get("medium", 0.40):
-            return "medium"
-        return "low"
+        return self._level_labels[bisect.bisect_right(self._level_bounds, pressure)]
 
 # ---------------- CLI -------------------------------------------------------
 
@@ -426,7 +849,7 @@ def _cli() -> None:
 
     det = S1Detector(config_path=args.config)
     res = det.classify(args.text, context_history=args.history or [])
-    print(json.dumps(res, indent=2, ensure_ascii=False))
+    print(json.dumps(res.to_dict(), indent=2, ensure_ascii=False))
 
 if __name__ == "__main__":
     _cli()
\ No newline at end of file
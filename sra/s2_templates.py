@@ -37,13 +37,24 @@ slot_filters:
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, Optional, List
+import string
+from typing import Any, Callable, Dict, Optional, List
 
 try:
     import yaml  # type: ignore
 except Exception:
     yaml = None  # YAML is optional
 
+try:
+    import re2  # optional linear-time engine (google-re2)
+except Exception:
+    re2 = None
+
+try:
+    import hyperscan  # optional vectorized multi-pattern matcher (Intel)
+except Exception:
+    hyperscan = None
+
 
 # ---- Built-in defaults (used if no YAML is provided) -----------------------
 
@@ -71,17 +82,86 @@ _DEFAULT_SLOT_FILTERS: Dict[str, List[str]] = {
 
 # ---- Utility helpers -------------------------------------------------------
 
+def _compile_one(pattern: str) -> re.Pattern:
+    """RE2 when installed (linear-time scans on long outputs), stdlib re
+    otherwise; falls back per pattern since RE2 rejects some constructs."""
+    if re2 is not None:
+        try:
+            return re2.compile(pattern, re.IGNORECASE | re.DOTALL)
+        except Exception:
+            pass
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
+
+
 def _compile_many(patterns: List[str]) -> List[re.Pattern]:
     out: List[re.Pattern] = []
     for p in patterns:
         try:
-            out.append(re.compile(p, re.IGNORECASE | re.DOTALL))
+            out.append(_compile_one(p))
         except re.error:
             # Skip invalid regex to keep engine robust in demos
             continue
     return out
 
 
+def _union_source(patterns: List[str]) -> Optional[str]:
+    """Join patterns into one alternation source string.
+
+    Leading (?i) prefixes are stripped (IGNORECASE is applied globally, and
+    mid-pattern global flags are a compile error when wrapped in a group);
+    patterns that do not compile on their own are left out, matching the
+    skip-invalid behaviour of _compile_many.
+    """
+    parts: List[str] = []
+    for p in patterns:
+        q = p[4:] if p.startswith("(?i)") else p
+        try:
+            re.compile(q, re.IGNORECASE | re.DOTALL)
+        except re.error:
+            continue
+        parts.append(f"(?:{q})")
+    return "|".join(parts) if parts else None
+
+
+def _build_union(patterns: List[str]) -> Optional[re.Pattern]:
+    """Compile patterns into one alternation so a check is a single scan."""
+    src = _union_source(patterns)
+    if src is None:
+        return None
+    try:
+        return _compile_one(src)
+    except re.error:
+        return None
+
+
+def _compile_template(tpl: str) -> Optional[Callable[..., str]]:
+    """Pre-parse a format string into literal/field segments once.
+
+    Rendering is then a list join instead of re-running str.format's parser
+    per call. Returns None for templates using conversions, format specs or
+    positional fields — those keep the plain .format path.
+    """
+    try:
+        segs: List[Any] = []
+        for literal, field, spec, conv in string.Formatter().parse(tpl):
+            if spec or conv or field == "":
+                return None
+            segs.append((literal, field))
+    except ValueError:
+        return None
+
+    def render(**kw: Any) -> str:
+        parts: List[str] = []
+        for literal, field in segs:
+            if literal:
+                parts.append(literal)
+            if field is not None:
+                parts.append(str(kw[field]))
+        return "".join(parts)
+
+    return render
+
+
 def _redact(text: str, regexes: List[re.Pattern], tag: str = "[REDACTED]") -> str:
     redacted = text
     for r in regexes:
@@ -107,9 +187,9 @@ class S2Templates:
     def __init__(self, config_path: Optional[str] = None) -> None:
         # Load config if available; otherwise fall back to defaults.
         self.templates: Dict[str, str] = dict(_DEFAULT_TEMPLATES)
-        self._forbidden_rx: List[re.Pattern] = _compile_many(_DEFAULT_FORBIDDEN)
-        self._slot_filters: Dict[str, List[re.Pattern]] = {
-            name: _compile_many(pats) for name, pats in _DEFAULT_SLOT_FILTERS.items()
+        forbidden_raw: List[str] = list(_DEFAULT_FORBIDDEN)
+        slot_raw: Dict[str, List[str]] = {
+            name: list(pats) for name, pats in _DEFAULT_SLOT_FILTERS.items()
         }
 
         if config_path and yaml:
@@ -127,26 +207,85 @@ class S2Templates:
                 # Forbidden patterns
                 fcfg = cfg.get("forbidden_patterns") or []
                 if isinstance(fcfg, list):
-                    self._forbidden_rx = _compile_many([p for p in fcfg if isinstance(p, str)])
+                    forbidden_raw = [p for p in fcfg if isinstance(p, str)]
 
                 # Slot filters
                 scfg = cfg.get("slot_filters") or {}
                 if isinstance(scfg, dict):
-                    compiled: Dict[str, List[re.Pattern]] = {}
+                    loaded: Dict[str, List[str]] = {}
                     for name, pats in scfg.items():
                         if isinstance(pats, list):
-                            compiled[name] = _compile_many([p for p in pats if isinstance(p, str)])
-                    if compiled:
-                        self._slot_filters = compiled
+                            loaded[name] = [p for p in pats if isinstance(p, str)]
+                    if loaded:
+                        slot_raw = loaded
             except Exception:
                 # Fail-closed to built-ins if file unreadable
                 pass
 
+        # Compile once per config load: per-pattern lists (kept as fallback
+        # when a union cannot be built) plus one alternation per set, so the
+        # leak check and each slot-filter group cost a single scan.
+        self._forbidden_rx: List[re.Pattern] = _compile_many(forbidden_raw)
+        self._forbidden_union: Optional[re.Pattern] = _build_union(forbidden_raw)
+
+        # Hyperscan database for the leak check, when the bindings are
+        # installed: one vectorized scan over the whole forbidden set with no
+        # backtracking. Any compile trouble just leaves the re paths in place.
+        self._hs_db = None
+        self._hs_scratch = None
+        if hyperscan is not None and forbidden_raw:
+            try:
+                exprs = [
+                    (p[4:] if p.startswith("(?i)") else p).encode("utf-8")
+                    for p in forbidden_raw
+                ]
+                flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_DOTALL
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=exprs,
+                    ids=list(range(len(exprs))),
+                    flags=[flags] * len(exprs),
+                )
+                self._hs_db = db
+                self._hs_scratch = hyperscan.Scratch(db)
+            except Exception:
+                self._hs_db = None
+                self._hs_scratch = None
+        self._slot_filters: Dict[str, List[re.Pattern]] = {
+            name: _compile_many(pats) for name, pats in slot_raw.items()
+        }
+
+        # Combined prefilter for slot sanitization: every redaction filter
+        # plus the control-char/whitespace cleanup folded into one
+        # alternation. One search decides "nothing to sanitize" — the common
+        # case — in a single pass; when it hits, the sequential per-filter
+        # subs in _sanitize_slot run as before.
+        all_slot_sources = [
+            src for src in (_union_source(pats) for pats in slot_raw.values())
+            if src is not None
+        ]
+        junk = r"[\x00-\x1F\s]{2,}|[\x00-\x1F]"
+        src = "|".join(all_slot_sources + [junk])
+        try:
+            self._sanitize_rx: Optional[re.Pattern] = re.compile(
+                src, re.IGNORECASE | re.DOTALL
+            )
+        except re.error:
+            self._sanitize_rx = None  # no prefilter: always run the subs
+
         # Pre-compile quick existence checks for performance
         self._tmpl_general = self.templates.get("general", _DEFAULT_TEMPLATES["general"])
         self._tmpl_academic = self.templates.get("academic", _DEFAULT_TEMPLATES["academic"])
         self._tmpl_refusal = self.templates.get("refusal", _DEFAULT_TEMPLATES["refusal"])
 
+        # Templates parsed once into render closures; .format stays as the
+        # fallback for any template _compile_template declines.
+        self._compiled: Dict[str, Callable[..., str]] = {}
+        for name, tpl in self.templates.items():
+            fn = _compile_template(tpl)
+            if fn is not None:
+                self._compiled[name] = fn
+
     # ---- Public API --------------------------------------------------------
 
     def generate_safe_response(
@@ -178,7 +317,7 @@ class S2Templates:
         # Final barrier: verify no forbidden pattern leaked
         if not self._verify_no_leakage(filled):
             # If a template somehow violates policy, fail-closed with refusal.
-            filled = self._tmpl_refusal.format(reason="Template safety verification failed")
+            filled = self._render_refusal("Template safety verification failed")
 
         return {"message": filled}
 
@@ -194,11 +333,15 @@ class S2Templates:
         """
         summary = f"Summary for: '{user_input[:80]}' (scope={scope})"
         safe_summary = self._sanitize_slot(summary)
-        filled = self._tmpl_academic.format(content=safe_summary)
+        fn = self._compiled.get("academic")
+        try:
+            filled = fn(content=safe_summary) if fn else self._tmpl_academic.format(content=safe_summary)
+        except Exception:
+            filled = self._render_refusal("Template formatting error")
 
         # Even for low-risk, run a quick no-leak check (defense-in-depth)
         if not self._verify_no_leakage(filled):
-            filled = self._tmpl_refusal.format(reason="Policy violation detected in full response")
+            filled = self._render_refusal("Policy violation detected in full response")
 
         return {"message": filled}
 
@@ -209,34 +352,71 @@ class S2Templates:
         Sanitize arbitrary slot text before insertion into templates.
         1) Hard redact tokens via configured slot filters.
         2) Collapse suspicious whitespace/control chars.
+        The filters run sequentially, one sub per pattern: redactions
+        compose (a later filter may match text exposed by an earlier one,
+        e.g. "secret: api_key: <token>"), which a single combined
+        leftmost-match pass cannot reproduce. The combined pattern is used
+        only as a prefilter so clean text costs one scan.
         """
+        if self._sanitize_rx is not None and self._sanitize_rx.search(text) is None:
+            return text.strip()
         out = text
-        # Apply redaction filters
-        for _, regexes in self._slot_filters.items():
+        # Apply redaction filters in order
+        for regexes in self._slot_filters.values():
             out = _redact(out, regexes)
         # Collapse control chars and aggressive whitespace
         out = re.sub(r"[\x00-\x1F]+", " ", out)
         out = re.sub(r"\s{2,}", " ", out).strip()
         return out
 
+    def _render_refusal(self, reason: str) -> str:
+        fn = self._compiled.get("refusal")
+        try:
+            return fn(reason=reason) if fn else self._tmpl_refusal.format(reason=reason)
+        except Exception:
+            return "Request blocked by policy."
+
     def _format_template(self, category: str, content: str) -> str:
         """
         Format a chosen template safely.
         Unknown categories fall back to 'general'.
         """
-        tmpl = self.templates.get(category, self._tmpl_general)
+        if category not in self.templates:
+            category = "general"
         # Only ever substitute the {content} slot
         safe_content = self._sanitize_slot(content)
+        fn = self._compiled.get(category)
         try:
-            return tmpl.format(content=safe_content)
+            if fn is not None:
+                return fn(content=safe_content)
+            return self.templates.get(category, self._tmpl_general).format(content=safe_content)
         except Exception:
             # Fail-closed if a template is malformed
-            return self._tmpl_refusal.format(reason="Template formatting error")
+            return self._render_refusal("Template formatting error")
 
     def _verify_no_leakage(self, text: str) -> bool:
         """
         Final check that output contains no forbidden patterns.
         """
+        if self._hs_db is not None:
+            hit = False
+
+            def _on_match(*_args: Any) -> int:
+                nonlocal hit
+                hit = True
+                return 1  # stop after first hit
+
+            try:
+                self._hs_db.scan(
+                    text.encode("utf-8"),
+                    match_event_handler=_on_match,
+                    scratch=self._hs_scratch,
+                )
+                return not hit
+            except Exception:
+                pass  # fall back to the re paths below
+        if self._forbidden_union is not None:
+            return self._forbidden_union.search(text) is None
         for rx in self._forbidden_rx:
             if rx.search(text):
                 return False
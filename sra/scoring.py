@@ -1,17 +1,58 @@
 # sra/scoring.py
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+import bisect
+import functools
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
 import math
 
-@dataclass(frozen=True)
+_EMPTY_BONUSES: Mapping[str, float] = MappingProxyType({})
+
+
+@functools.lru_cache(maxsize=2048)
+def _logistic(q: int) -> float:
+    """1 - exp(-q/10000), memoized on the exponent quantized to 1e-4.
+
+    Weighted-match sums come from a small discrete set, so hot repeats turn
+    the libm call into a dict hit; the quantization error is far below the
+    0.01-wide decision margins of the threshold bands."""
+    return 1.0 - math.exp(-q / 10000.0)
+
+@dataclass(frozen=True, slots=True)
 class PressureConfig:
     thresholds: Dict[str, float]             # {"low":0.2,"medium":0.4,"high":0.7,"critical":0.9}
     logistic_k: float = 0.9
     intent_bonus: float = 0.20               # applied once if any suspicious intents present
     context_bonus: float = 0.10              # applied once if any anomaly flags present
     # Optionally: per-intent/flag bonuses instead of flat ones
-    per_intent_bonus: Dict[str, float] = None
-    per_flag_bonus: Dict[str, float] = None
+    per_intent_bonus: Mapping[str, float] = field(default_factory=lambda: _EMPTY_BONUSES)
+    per_flag_bonus: Mapping[str, float] = field(default_factory=lambda: _EMPTY_BONUSES)
+    # Derived (cached in __post_init__): slots need them declared as fields
+    _level_bounds: Tuple[float, ...] = field(init=False, repr=False)
+    _level_labels: Tuple[str, ...] = field(init=False, repr=False)
+    _k_scaled: float = field(init=False, repr=False)
+    _use_per_intent: bool = field(init=False, repr=False)
+    _use_per_flag: bool = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Tolerate explicit None (the old default) and resolve the per-table
+        # vs flat-bonus choice once instead of re-testing truthiness per call.
+        if self.per_intent_bonus is None:
+            object.__setattr__(self, "per_intent_bonus", _EMPTY_BONUSES)
+        if self.per_flag_bonus is None:
+            object.__setattr__(self, "per_flag_bonus", _EMPTY_BONUSES)
+        object.__setattr__(self, "_use_per_intent", bool(self.per_intent_bonus))
+        object.__setattr__(self, "_use_per_flag", bool(self.per_flag_bonus))
+        # Sorted bounds + labels cached once so _to_level is a single bisect
+        # instead of three dict lookups per score (frozen: set via object).
+        th = self.thresholds or {}
+        object.__setattr__(self, "_level_bounds", (
+            th.get("medium", 0.40), th.get("high", 0.70), th.get("critical", 0.90),
+        ))
+        object.__setattr__(self, "_level_labels", ("low", "medium", "high", "critical"))
+        # logistic_k pre-scaled by the quantization factor: one multiply per
+        # call instead of two on the _logistic hot path.
+        object.__setattr__(self, "_k_scaled", self.logistic_k * 10000.0)
 
 def aggregate_pressure(
     matches: List[Dict],
@@ -24,16 +65,17 @@ def aggregate_pressure(
     if s > 0:
         reasons.append(f"{len(matches)} pattern match(es) detected")
 
-    base = 1.0 - math.exp(-cfg.logistic_k * s)
+    base = _logistic(int(cfg._k_scaled * s))
     pressure = base
 
-    # Intent bonuses
+    # Intent bonuses: hash-set intersection touches only keys present in both
+    # sides instead of a .get per element
     applied_intent_bonus = False
-    if cfg.per_intent_bonus:
-        for it in intents:
-            b = cfg.per_intent_bonus.get(it)
-            if b:
-                pressure += b; applied_intent_bonus = True
+    if cfg._use_per_intent:
+        bonus = sum(cfg.per_intent_bonus[k]
+                    for k in cfg.per_intent_bonus.keys() & set(intents))
+        if bonus:
+            pressure += bonus; applied_intent_bonus = True
     elif intents:
         pressure += cfg.intent_bonus; applied_intent_bonus = True
     if applied_intent_bonus:
@@ -41,24 +83,21 @@ def aggregate_pressure(
 
     # Context bonuses
     applied_flag_bonus = False
-    if cfg.per_flag_bonus:
-        for fl in flags:
-            b = cfg.per_flag_bonus.get(fl)
-            if b:
-                pressure += b; applied_flag_bonus = True
+    if cfg._use_per_flag:
+        bonus = sum(cfg.per_flag_bonus[k]
+                    for k in cfg.per_flag_bonus.keys() & set(flags))
+        if bonus:
+            pressure += bonus; applied_flag_bonus = True
     elif flags:
         pressure += cfg.context_bonus; applied_flag_bonus = True
     if applied_flag_bonus:
         reasons.append("context anomaly")
 
     pressure = max(0.0, min(1.0, pressure))
-    level = _to_level(pressure, cfg.thresholds)
+    level = _to_level(pressure, cfg)
     if not reasons:
         reasons = ["no risky pattern matched"]
     return pressure, reasons, level
 
-def _to_level(p: float, th: Dict[str, float]) -> str:
-    if p >= th.get("critical", 0.90): return "critical"
-    if p >= th.get("high", 0.70):     return "high"
-    if p >= th.get("medium", 0.40):   return "medium"
-    return "low"
\ No newline at end of file
+def _to_level(p: float, cfg: PressureConfig) -> str:
+    return cfg._level_labels[bisect.bisect_right(cfg._level_bounds, p)]
\ No newline at end of file
@@ -0,0 +1,10 @@
+from sra.copper_ground import CopperGround
+
+
+def test_minimum_length_email_redacted():
+    # Regression: the short-string gate must not exceed the shortest
+    # redactable value ("a@b.co", 6 chars) or minimal emails leak through
+    # both the context walk and the batch sweep.
+    cg = CopperGround()
+    assert cg._redact_dict({"email": "a@b.co"}) == {"email": "[REDACTED_EMAIL]"}
+    assert cg._batch_redact_contexts([{"email": "a@b.co"}]) == [{"email": "[REDACTED_EMAIL]"}]